@@ -0,0 +1,242 @@
+import io
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+
+import ats_scoring
+from instrumentation import span
+from llm_cache import normalize_text
+from resume_cache import cached_parse_resume
+from resume_parser import PARSER_VERSION, read_pdf_bytes
+from session_store import compact_job, compact_resume
+from job_parser import parse_job_description
+from skill_analyzer import analyze_skill_distribution
+from ats_scoring import compute_ats_score, compute_ats_score_stream
+from fit_reasoning import analyze_fit
+from local_ats import compute_local_ats_score
+from skill_matcher import TAXONOMY_VERSION
+from stage_graph import StageGraph, input_key
+
+
+# -------------------------------
+# Per-stage timeouts (seconds)
+# -------------------------------
+DEFAULT_TIMEOUTS: Dict[str, float] = {
+    "parse_resume": 30.0,
+    "parse_job": 10.0,
+    "ats": 60.0,
+}
+
+# -------------------------------
+# Stage graph: inputs each stage depends on + version that invalidates it
+# -------------------------------
+ANALYSIS_STAGES = {
+    "parse_resume": (("resume",), f"parser={PARSER_VERSION}|taxonomy={TAXONOMY_VERSION}"),
+    "parse_job": (("job",), f"taxonomy={TAXONOMY_VERSION}"),
+    "fit": (("resume", "job"), f"taxonomy={TAXONOMY_VERSION}"),
+    "local_ats": (("resume", "job"), f"taxonomy={TAXONOMY_VERSION}"),
+    "ats": (("resume", "job"), f"{ats_scoring.MODEL}|{ats_scoring.PROMPT_VERSION}"),
+}
+
+
+def new_stage_graph(max_entries: int = 32) -> StageGraph:
+    """
+    Per-session memo for run_analysis (keep it e.g. in st.session_state).
+    Parsed resumes / JDs are memoized in their compact, shared-text form.
+    """
+    return StageGraph(
+        ANALYSIS_STAGES, max_entries,
+        compactors={"parse_resume": compact_resume, "parse_job": compact_job},
+    )
+
+
+# Shared by every Streamlit session and the service. Local stages (parsing)
+# are short; ATS calls can run for a minute and keep running after a
+# StageTimeout, so they get their own pool and can never starve parsing.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis")
+_llm_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis-llm")
+
+
+class StageTimeout(Exception):
+    """
+    Raised when a required pipeline stage does not finish in time.
+    """
+
+    def __init__(self, stage: str, seconds: float):
+        super().__init__(f"Stage '{stage}' did not finish within {seconds:g}s")
+        self.stage = stage
+        self.seconds = seconds
+
+
+def _staged(stage: str, fn: Callable, *args):
+    # Runs on the worker thread so LLM calls inside are attributed to ``stage``
+    with span(stage):
+        return fn(*args)
+
+
+def _wait(future, stage: str, timeouts: Dict[str, float]):
+    try:
+        return future.result(timeout=timeouts[stage])
+    except FutureTimeout:
+        future.cancel()
+        raise StageTimeout(stage, timeouts[stage])
+
+
+def _stream_ats(
+    client, resume_data: dict, job_data: dict, updates: "queue.Queue", abandoned: threading.Event
+) -> dict:
+    # Worker side of a streamed ATS stage: partial results go to ``updates``
+    # until the waiting thread gives up; the stream is still read to the
+    # end so the final result is memoized for the next run
+    result = None
+    for result in compute_ats_score_stream(client, resume_data, job_data):
+        if not abandoned.is_set():
+            updates.put(result)
+    return result
+
+
+def _wait_with_updates(
+    future,
+    updates: "queue.Queue",
+    abandoned: threading.Event,
+    callback: Callable[[dict], None],
+    stage: str,
+    timeouts: Dict[str, float],
+):
+    # Like _wait, but hands queued partial results to ``callback`` on the
+    # calling thread (Streamlit elements cannot be updated from workers)
+    deadline = time.monotonic() + timeouts[stage]
+    try:
+        while not future.done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                future.cancel()
+                raise StageTimeout(stage, timeouts[stage])
+            try:
+                callback(updates.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                pass
+        # Updates queued just before the worker finished
+        while True:
+            try:
+                callback(updates.get_nowait())
+            except queue.Empty:
+                break
+        return future.result()
+    finally:
+        # Timed out, or the callback raised: the worker stops queueing
+        abandoned.set()
+
+
+# -------------------------------
+# MAIN: concurrent analysis
+# -------------------------------
+def run_analysis(
+    client,
+    resume_file,
+    job_desc: str,
+    timeouts: Optional[Dict[str, float]] = None,
+    on_local_score: Optional[Callable[[dict], None]] = None,
+    graph: Optional[StageGraph] = None,
+    on_ats_progress: Optional[Callable[[dict], None]] = None,
+) -> Dict:
+    """
+    Runs the Analyze pipeline with overlapping stages:
+    - resume PDF and JD are parsed in parallel
+    - the remote ATS request starts as soon as the resume text exists
+    - distributions, fit reasoning and the local ATS estimate run while
+      ATS is in flight; ``on_local_score`` receives the estimate at once
+    Without a client, or when the ATS call exceeds its timeout, the local
+    estimate is the final score. A timed-out request keeps running in the
+    background and its result still lands in the LLM cache.
+
+    With ``on_ats_progress`` the ATS response is streamed and the callback
+    receives the partial result each time a field (score, breakdown,
+    missing skills, summary) completes; it runs on the calling thread.
+
+    With a ``graph`` (see new_stage_graph) every stage is memoized by the
+    hashes of the inputs it depends on, so re-running after editing only
+    the JD reuses the parsed resume, and vice versa.
+    """
+    timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+    graph = graph or new_stage_graph()
+    graph.begin_run()
+
+    pdf_bytes = read_pdf_bytes(resume_file)
+    inputs = {
+        "resume": input_key(pdf_bytes),
+        # Whitespace-only edits of the JD do not change any stage
+        "job": input_key(normalize_text(job_desc)),
+    }
+
+    resume_future = graph.submit(
+        _executor, "parse_resume", inputs,
+        _staged, "parse_resume", cached_parse_resume, io.BytesIO(pdf_bytes),
+    )
+    job_future = graph.submit(
+        _executor, "parse_job", inputs,
+        _staged, "parse_job", parse_job_description, job_desc,
+    )
+
+    resume_data = _wait(resume_future, "parse_resume", timeouts)
+
+    # ATS only needs the raw JD text, so it does not wait for JD parsing.
+    # Fallback results (AI call failed) are not memoized.
+    ats_future = None
+    ats_updates: "queue.Queue" = queue.Queue()
+    ats_abandoned = threading.Event()
+    if client:
+        ats_job = {"raw_text": job_desc.strip()}
+        if on_ats_progress:
+            ats_call = (_stream_ats, client, resume_data, ats_job, ats_updates, ats_abandoned)
+        else:
+            ats_call = (compute_ats_score, client, resume_data, ats_job)
+        ats_future = graph.submit(
+            _llm_executor, "ats", inputs, *ats_call,
+            cacheable=lambda result: "error" not in result,
+        )
+
+    job_data = _wait(job_future, "parse_job", timeouts)
+
+    def fit():
+        with span("fit"):
+            resume_dist = analyze_skill_distribution(resume_data["skills"])
+            job_dist = analyze_skill_distribution(job_data["skills"])
+            return analyze_fit(resume_dist, job_dist, job_data["category"])
+
+    def local_ats():
+        with span("local_ats"):
+            return compute_local_ats_score(resume_data, job_data)
+
+    fit_result = graph.run("fit", inputs, fit)
+    local_result = graph.run("local_ats", inputs, local_ats)
+    if on_local_score and not (ats_future is not None and ats_future.done()):
+        on_local_score(local_result)
+
+    if ats_future is None:
+        ats_result = dict(local_result)
+        ats_result["summary"] = f"API Key needed for AI scoring, showing local estimate. {local_result['summary']}"
+    else:
+        try:
+            if on_ats_progress:
+                ats_result = _wait_with_updates(
+                    ats_future, ats_updates, ats_abandoned, on_ats_progress, "ats", timeouts
+                )
+            else:
+                ats_result = _wait(ats_future, "ats", timeouts)
+        except StageTimeout:
+            ats_result = dict(local_result)
+            ats_result["summary"] = (
+                f"AI scoring did not respond within {timeouts['ats']:g}s, showing local estimate. "
+                f"{local_result['summary']}"
+            )
+
+    return {
+        "resume_data": resume_data,
+        "job_data": job_data,
+        "ats_result": ats_result,
+        "fit_result": fit_result,
+        "input_keys": inputs,
+    }
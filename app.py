@@ -1,4 +1,3 @@
-from openai import OpenAI
 import streamlit as st
 import os
 
@@ -9,12 +8,24 @@ def _rerun():
     else:
         st.experimental_rerun()
 
-from resume_parser import parse_resume
-from job_parser import parse_job_description
-from skill_analyzer import analyze_skill_distribution
-from ats_scoring import compute_ats_score
-from fit_reasoning import analyze_fit
+# Render a token stream progressively; returns the full text once done.
+# (Placeholder-based so it also works where st.write_stream is missing.)
+def _render_stream(chunks, placeholder=None, show=None) -> str:
+    placeholder = placeholder or st.empty()
+    show = show or placeholder.markdown
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        show(text + "▌")
+    show(text)
+    return text
+
+from analysis_pipeline import new_stage_graph, run_analysis, StageTimeout
 from chatbot import Chatbot
+from llm_client import get_client
+from llm_transport import is_offline, transport_mode
+from session_store import REGISTRY, TEXTS, current_session
+import instrumentation
 
 # ================= PAGE CONFIG =================
 st.set_page_config(
@@ -41,36 +52,51 @@ with st.sidebar:
     except Exception:
         api_key = ""
 
+    if not api_key and is_offline():
+        # LLM_TRANSPORT=replay/synthetic answers locally, any key works
+        api_key = "offline"
+        st.caption(f"LLM transport: {transport_mode()} (offline)")
+
     if not api_key:
         # User must provide their own key
         api_key = st.text_input("Grok API Key", type="password")
 
-    # Initialize OpenAI Client (for Grok)
+    # Shared OpenAI-compatible client (pooled, rate-limited, retried);
+    # the same object is returned on every rerun and for every session
     client = None
     if api_key:
         try:
-            client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1" if "gsk_" in api_key else "https://api.x.ai/v1", 
-            )
+            client = get_client(api_key)
         except Exception as e:
             st.sidebar.error(f"Error initializing API: {e}")
 
     analyze_btn = st.button("Analyze", type="primary")
 
+# Compact per-session record (results, histories, bots); idle sessions
+# lose their heavy fields and every session is kept within its budget
+session = current_session(st.session_state)
+
+# Keep one bot object per session and client instead of rebuilding it on every rerun
+def _session_bot(name: str, factory, client):
+    bot = session.bots.get(name)
+    if bot is None or bot.client is not client:
+        bot = factory(client)
+        session.bots[name] = bot
+    return bot
+
 # ================= CHATBOT INIT =================
 chatbot = None
 if client:
     try:
-        chatbot = Chatbot(client=client)
+        chatbot = _session_bot("chatbot", Chatbot, client)
     except Exception as e:
         st.sidebar.error(f"Error initializing chatbot: {e}")
 else:
     st.sidebar.warning("API Key required to enable Chatbot.")
 
 # ================= INITIAL SESSION STATE =================
-if "analyzed" not in st.session_state:
-    st.session_state.analyzed = False
+if session.evicted and not analyze_btn:
+    st.info("This session was idle, so its results were released. Press Analyze to run it again.")
 
 # ================= RUN ANALYSIS =================
 if analyze_btn:
@@ -81,41 +107,60 @@ if analyze_btn:
 
     with st.spinner("Analyzing resume-job compatibility..."):
 
-        # Reset chat history for new analysis
-        st.session_state.chat_history = []
+        # Per-session stage memo: only stages whose inputs changed rerun
+        if session.graph is None:
+            session.graph = new_stage_graph(max_entries=10)
+        graph = session.graph
+
+        # Instant local estimate, shown while the AI score is pending
+        provisional = st.empty()
 
-        resume_data = parse_resume(resume_file)
-        job_data = parse_job_description(job_desc)
+        def _show_local_score(local_result):
+            provisional.info(
+                f"Quick local estimate: {local_result['overall_score']}/100 "
+                "(waiting for AI score...)"
+            )
 
-        resume_dist = analyze_skill_distribution(resume_data["skills"])
-        job_dist = analyze_skill_distribution(job_data["skills"])
+        # Streamed AI score: each field appears as soon as it is generated
+        def _show_ats_progress(partial):
+            with provisional.container():
+                if "overall_score" in partial:
+                    st.metric("Overall Match", f"{partial['overall_score']}/100")
+                if partial.get("missing_skills"):
+                    st.caption(f"Missing Critical Skills: {', '.join(partial['missing_skills'])}")
+                st.caption(partial.get("summary", "Writing the summary..."))
 
-        # NEW: Compute AI-powered ATS Score
-        if client:
-            ats_result = compute_ats_score(client, resume_data, job_data)
-        else:
-             ats_result = {"overall_score": 0, "summary": "API Key needed for scoring."}
+        # Parsing, fit reasoning and the remote ATS call run concurrently
+        try:
+            result = run_analysis(
+                client, resume_file, job_desc, on_local_score=_show_local_score, graph=graph,
+                on_ats_progress=_show_ats_progress,
+            )
+        except StageTimeout as e:
+            st.error(f"Analysis timed out: {e}")
+            st.stop()
+        provisional.empty()
+
+        # Reset chat history only when the resume or JD actually changed
+        if result["input_keys"] != session.analysis_inputs:
+            session.chat_history = []
+            if chatbot:
+                chatbot.reset()
 
-        fit_result = analyze_fit(
-            resume_dist,
-            job_dist,
-            job_data["category"]
-        )
+        reused = [stage for stage, status in graph.last_run.items() if status == "reused"]
+        if reused:
+            st.caption(f"Reused unchanged results: {', '.join(reused)}")
 
-        # ✅ STORE RESULTS
-        st.session_state.resume_data = resume_data
-        st.session_state.job_data = job_data
-        st.session_state.ats_result = ats_result
-        st.session_state.fit_result = fit_result
-        st.session_state.analyzed = True
+        # ✅ STORE RESULTS (texts deduplicated across sessions, skills interned)
+        session.store_analysis(result)
 
 # ================= SHOW RESULTS (STATE-BASED) =================
-if st.session_state.analyzed:
+if session.analyzed:
 
-    resume_data = st.session_state.resume_data
-    job_data = st.session_state.job_data
-    ats_result = st.session_state.ats_result
-    fit_result = st.session_state.fit_result
+    resume_data = session.resume_data
+    job_data = session.job_data
+    ats_result = session.ats_result
+    fit_result = session.fit_result
 
     # ================= TABS FOR V2 FEATURES =================
     tab1, tab2, tab3, tab4 = st.tabs(["Analysis", "Cover Letter", "Resume Refinement", "Mock Interview"])
@@ -125,7 +170,10 @@ if st.session_state.analyzed:
         # ... (Existing ATS and Fit Panels)
         with col1:
             st.subheader("AI Match Score")
-            st.metric("Overall Match", f"{ats_result.get('overall_score', 0)}/100")
+            if ats_result.get("error"):
+                st.warning(f"AI scoring failed: {ats_result['error']}")
+            label = "Overall Match (local estimate)" if ats_result.get("source") == "local" else "Overall Match"
+            st.metric(label, f"{ats_result.get('overall_score', 0)}/100")
             st.caption(ats_result.get("summary", "Analysis complete."))
             with st.expander("Match Breakdown"):
                 breakdown = ats_result.get("breakdown", {})
@@ -153,70 +201,120 @@ if st.session_state.analyzed:
 
     with tab2:
         st.header("AI Cover Letter Generator")
-        from cover_letter_generator import generate_cover_letter
+        from cover_letter_generator import stream_cover_letter
         
         tone = st.selectbox("Select Tone", ["Professional", "Enthusiastic", "Confident", "Humble"])
+        fresh_draft = st.checkbox("Write a fresh draft (ignore cached letter)")
         if st.button("Generate Cover Letter"):
             if client:
-                with st.spinner("Drafting your cover letter..."):
-                    letter = generate_cover_letter(client, resume_data["text"], job_data["raw_text"], tone)
-                    st.text_area("Generated Cover Letter", letter, height=400)
-                    st.download_button("Download as Text", letter, file_name="Cover_Letter.txt")
+                draft = st.empty()
+                letter = _render_stream(stream_cover_letter(
+                    client, resume_data["text"], job_data["raw_text"], tone,
+                    use_cache=not fresh_draft
+                ), draft)
+                draft.empty()
+                st.text_area("Generated Cover Letter", letter, height=400)
+                st.download_button("Download as Text", letter, file_name="Cover_Letter.txt")
             else:
                 st.error("API Key required.")
 
     with tab3:
         st.header("Resume Refinement")
-        from resume_refiner import refine_resume_section
+        from resume_refiner import refine_resume, refine_resume_section
+        from resume_parser import extract_text_from_pdf, read_pdf_bytes
+        from stage_graph import input_key
+
+        def _show_improvements(improvements):
+            for item in improvements:
+                with st.expander(f"Original: {item['original'][:50]}...", expanded=True):
+                    st.write(f"**Original:** {item['original']}")
+                    st.success(f"**Rewrite:** {item['rewrite']}")
+                    st.caption(f"**Reason:** {item['explanation']}")
+
+        mode = st.radio("Refine", ["A pasted section", "My whole resume"], horizontal=True)
+
+        if mode == "A pasted section":
+            st.info("Select a text block from your resume (copy-paste below) to let AI rewrite it for this job.")
+
+            user_text = st.text_area("Paste Resume Section (e.g., Experience Bullet Points)", height=150)
+
+            if st.button("Refine Section"):
+                if user_text and client:
+                    with st.spinner("Refining your resume..."):
+                        refinement_result = refine_resume_section(client, user_text, job_data["raw_text"])
+
+                        if "error" in refinement_result:
+                            st.error(refinement_result["error"])
+                        else:
+                            _show_improvements(refinement_result.get("improvements", []))
+                elif not client:
+                    st.error("API Key required.")
+                else:
+                    st.warning("Please paste some text to refine.")
+        else:
+            st.info("Your resume is split into sections and bullet groups that are refined in parallel. "
+                    "Unchanged bullets are answered from the cache on later runs.")
+
+            if st.button("Refine Whole Resume"):
+                # The stored text is lowercased for matching; headings and the
+                # rewrites need the original case, so re-extract the upload
+                pdf_bytes = read_pdf_bytes(resume_file) if resume_file else None
+                if not client:
+                    st.error("API Key required.")
+                elif pdf_bytes is None or input_key(pdf_bytes) != session.analysis_inputs["resume"]:
+                    st.warning("Upload the analyzed resume again to refine it.")
+                else:
+                    progress = st.progress(0.0, text="Refining your resume...")
+
+                    def _on_progress(done, total):
+                        progress.progress(done / total, text=f"Refined {done} of {total} chunks")
+
+                    refinement_result = refine_resume(
+                        client, extract_text_from_pdf(pdf_bytes, lowercase=False), job_data["raw_text"],
+                        on_progress=_on_progress,
+                    )
+                    progress.empty()
 
-        st.info("Select a text block from your resume (copy-paste below) to let AI rewrite it for this job.")
-        
-        user_text = st.text_area("Paste Resume Section (e.g., Experience Bullet Points)", height=150)
-        
-        if st.button("Refine Section"):
-            if user_text and client:
-                with st.spinner("Refining your resume..."):
-                    refinement_result = refine_resume_section(client, user_text, job_data["raw_text"])
-                    
                     if "error" in refinement_result:
                         st.error(refinement_result["error"])
                     else:
-                        for item in refinement_result.get("improvements", []):
-                            with st.expander(f"Original: {item['original'][:50]}...", expanded=True):
-                                st.write(f"**Original:** {item['original']}")
-                                st.success(f"**Rewrite:** {item['rewrite']}")
-                                st.caption(f"**Reason:** {item['explanation']}")
-            elif not client:
-                st.error("API Key required.")
-            else:
-                st.warning("Please paste some text to refine.")
+                        if refinement_result["reused"]:
+                            st.caption(f"{refinement_result['reused']} of {refinement_result['chunks']} chunks reused from cache.")
+                        for failed in refinement_result["errors"]:
+                            st.warning(f"Could not refine a {failed['section'] or 'resume'} chunk: {failed['error']}")
+                        section = None
+                        for item in refinement_result["improvements"]:
+                            if item["section"] != section:
+                                section = item["section"]
+                                st.subheader(section.title() or "Header")
+                            _show_improvements([item])
 
     with tab4:
         st.header("Mock Interview Simulator")
         from interview_bot import InterviewBot
 
-        if "interview_history" not in st.session_state:
-            st.session_state.interview_history = []
-        if "interview_active" not in st.session_state:
+        if "interview_active" not in st.session_state or not session.interview_history:
+            # Also after the history was released for an idle session
             st.session_state.interview_active = False
             
         if st.button("Start/Reset Interview"):
             if client:
                 st.session_state.interview_active = True
-                st.session_state.interview_history = []
-                interviewer = InterviewBot(client)
-                first_q = interviewer.generate_question(job_data["raw_text"], [])
-                st.session_state.interview_history.append({"role": "assistant", "content": first_q})
-                st.rerun()
+                session.interview_history = []
+                interviewer = _session_bot("interviewer", InterviewBot, client)
+                with st.chat_message("assistant"):
+                    first_q = _render_stream(interviewer.generate_question_stream(job_data["raw_text"], []))
+                session.interview_history.append({"role": "assistant", "content": first_q})
+                _rerun()
             else:
                 st.error("API Key required.")
 
         if st.session_state.interview_active:
             if client:
-                interviewer = InterviewBot(client)
+                interviewer = _session_bot("interviewer", InterviewBot, client)
                 
                 # Display history
-                for msg in st.session_state.interview_history:
+                for msg in session.interview_history:
                     with st.chat_message(msg["role"]):
                         st.write(msg["content"])
                         if msg.get("feedback"):
@@ -224,20 +322,25 @@ if st.session_state.analyzed:
 
                 # User input
                 if answer := st.chat_input("Your answer..."):
-                    st.session_state.interview_history.append({"role": "user", "content": answer})
+                    session.interview_history.append({"role": "user", "content": answer})
                     with st.chat_message("user"):
                         st.write(answer)
-                    
-                    # feedback
-                    last_q = st.session_state.interview_history[-2]["content"]
-                    feedback = interviewer.evaluate_answer(last_q, answer)
-                    
+                        # feedback, shown like the history replay above
+                        last_q = session.interview_history[-2]["content"]
+                        feedback_box = st.empty()
+                        feedback = _render_stream(
+                            interviewer.evaluate_answer_stream(last_q, answer), feedback_box,
+                            show=lambda text: feedback_box.info(f"Feedback: {text}"),
+                        )
+
                     # next question
-                    with st.spinner("Interviewer is thinking..."):
-                        next_q = interviewer.generate_question(job_data["raw_text"], st.session_state.interview_history)
-                        st.session_state.interview_history[-1]["feedback"] = feedback # Attach feedback to user answer
-                        st.session_state.interview_history.append({"role": "assistant", "content": next_q})
-                        _rerun()
+                    with st.chat_message("assistant"):
+                        next_q = _render_stream(
+                            interviewer.generate_question_stream(job_data["raw_text"], session.interview_history)
+                        )
+                    session.interview_history[-1]["feedback"] = feedback # Attach feedback to user answer
+                    session.interview_history.append({"role": "assistant", "content": next_q})
+                    _rerun()
             else:
                 st.error("API Key required to continue interview.")
 
@@ -246,11 +349,8 @@ if st.session_state.analyzed:
     if chatbot:
         st.subheader("Career Guidance Chatbot")
 
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
-
         # Display chat history first
-        for msg in st.session_state.chat_history:
+        for msg in session.chat_history:
             with st.chat_message(msg["role"]):
                 st.write(msg["content"])
 
@@ -258,13 +358,13 @@ if st.session_state.analyzed:
         if prompt := st.chat_input("Ask about resume improvement or job fit..."):
             
             # Add user message to state and display it immediately
-            st.session_state.chat_history.append({"role": "user", "content": prompt})
+            session.chat_history.append({"role": "user", "content": prompt})
             with st.chat_message("user"):
                 st.write(prompt)
 
-            # Generate response
-            with st.spinner("Thinking..."):
-                response = chatbot.ask_question(
+            # Stream the response as it is generated
+            with st.chat_message("assistant"):
+                response = _render_stream(chatbot.ask_question_stream(
                     prompt,
                     context={
                         "resume_data": resume_data,
@@ -272,9 +372,38 @@ if st.session_state.analyzed:
                         "ats_result": ats_result,
                         "fit_result": fit_result
                     }
-                )
-
-            # Add assistant response to state and display it immediately
-            st.session_state.chat_history.append({"role": "assistant", "content": response})
-            with st.chat_message("assistant"):
-                st.write(response)
+                ))
+
+            # Add assistant response to state
+            session.chat_history.append({"role": "assistant", "content": response})
+
+# ================= METRICS (RESUME_ANALYZER_METRICS=1) =================
+if instrumentation.is_enabled():
+    from llm_cache import get_default_cache as get_llm_cache
+    from model_router import ROUTER
+    from resume_cache import get_default_cache as get_resume_cache
+
+    with st.sidebar.expander("Metrics"):
+        snap = instrumentation.snapshot()
+        st.caption("Stage timings (seconds)")
+        st.table([
+            {"stage": h["labels"].get("stage"), "count": h["count"], "mean": h["mean"], "p95 ≤": h["p95_le"]}
+            for h in snap["histograms"] if h["name"] == "stage_duration_seconds"
+        ])
+        st.caption("LLM calls and tokens")
+        st.table([
+            {"metric": c["name"], **c["labels"], "value": c["value"]}
+            for c in snap["counters"] if c["name"].startswith("llm_")
+        ])
+        st.caption("Models (routed latency / errors)")
+        st.table([{"model": model, **stats} for model, stats in ROUTER.stats().items()])
+        st.caption("Caches")
+        st.json({"resume_cache": get_resume_cache().stats(), "llm_cache": get_llm_cache().stats()})
+        st.caption("Sessions")
+        st.json({
+            "this_session_bytes": session.approx_bytes(),
+            **REGISTRY.stats(),
+            "shared_texts": TEXTS.stats(),
+        })
+        st.download_button("Prometheus", instrumentation.render_prometheus(), file_name="metrics.prom")
+        st.download_button("JSON", instrumentation.render_json(), file_name="metrics.json")
@@ -1,14 +1,22 @@
 import json
+from typing import Any, Dict, Iterator
 
-def compute_ats_score(client, resume_data: dict, job_data: dict) -> dict:
-    """
-    Computes an AI-powered ATS score using Groq (OpenAI Client).
-    Returns a JSON object with score and reasoning.
-    """
-    
-    resume_text = resume_data.get("text", "")
-    job_text = job_data.get("raw_text", "")
-    
+from instrumentation import span
+from json_stream import JSONObjectStream
+from llm_cache import get_default_cache, make_key
+from llm_streaming import stream_completion
+from local_ats import compute_local_ats_score
+from model_router import complete, primary_model
+
+MODEL = primary_model("ats")
+
+# Bump whenever the prompt below changes (invalidates cached scores)
+PROMPT_VERSION = "1"
+
+BREAKDOWN_KEYS = ("skill_match", "experience_relevance", "formatting")
+
+
+def _build_messages(resume_text: str, job_text: str) -> list:
     prompt = f"""
     You are an expert AI Resume Analyzer and Recruiter. 
     Evaluate the candidate's resume against the job description strictly and objectively.
@@ -37,25 +45,156 @@ def compute_ats_score(client, resume_data: dict, job_data: dict) -> dict:
         "summary": "<short analysis>"
     }}
     """
+    return [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+# -------------------------------
+# Schema validation
+# -------------------------------
+def _score(value, field: str):
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip("%"))
+        except ValueError:
+            raise ValueError(f"'{field}' is not a number: {value!r}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{field}' is not a number: {value!r}")
+    if not 0 <= value <= 100:
+        raise ValueError(f"'{field}' is outside 0-100: {value!r}")
+    return int(value) if float(value).is_integer() else value
+
+
+def validate_ats_field(field: str, value: Any) -> Any:
+    """
+    Checks one field of the ATS response and returns it normalized
+    (numeric strings become numbers). Unknown fields pass unchanged;
+    raises ValueError on a malformed field.
+    """
+    if field == "overall_score":
+        return _score(value, field)
+    if field == "breakdown":
+        if not isinstance(value, dict):
+            raise ValueError("'breakdown' is not an object")
+        return {k: _score(v, f"breakdown.{k}") if k in BREAKDOWN_KEYS else v for k, v in value.items()}
+    if field == "missing_skills":
+        if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+            raise ValueError("'missing_skills' is not a list of strings")
+        return value
+    if field == "summary":
+        if not isinstance(value, str):
+            raise ValueError("'summary' is not a string")
+        return value
+    return value
+
+
+def validate_ats_result(result: Any) -> Dict[str, Any]:
+    """
+    Validates a complete ATS response; ``overall_score`` is required.
+    """
+    if not isinstance(result, dict):
+        raise ValueError("ATS response is not a JSON object")
+    if "overall_score" not in result:
+        raise ValueError("ATS response has no 'overall_score'")
+    return {field: validate_ats_field(field, value) for field, value in result.items()}
+
+
+def _local_fallback(resume_data: dict, job_data: dict, error: Exception) -> dict:
+    print(f"AI Scoring Failed: {error}")
+    # Fall back to the deterministic local scorer so the page still has a score
+    result = compute_local_ats_score(resume_data, job_data)
+    result["summary"] = f"AI scoring unavailable, showing local estimate. {result['summary']}"
+    result["error"] = str(error)
+    return result
+
+
+def compute_ats_score(client, resume_data: dict, job_data: dict, use_cache: bool = True) -> dict:
+    """
+    Computes an AI-powered ATS score using Groq (OpenAI Client).
+    Returns a JSON object with score and reasoning.
+    Results for identical inputs are served from the LLM cache
+    unless ``use_cache`` is False.
+    """
     
+    resume_text = resume_data.get("text", "")
+    job_text = job_data.get("raw_text", "")
+    
+    cache = get_default_cache()
+    key = make_key(MODEL, PROMPT_VERSION, resume_text, job_text)
+
+    def score() -> dict:
+        with span("ats"):
+            response = complete(
+                client, "ats",
+                messages=_build_messages(resume_text, job_text),
+                response_format={"type": "json_object"}
+            )
+            return validate_ats_result(json.loads(response.choices[0].message.content))
+
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        result = json.loads(response.choices[0].message.content)
+        if use_cache:
+            # Identical scoring requests already in flight are joined, not repeated
+            return cache.get_or_compute(key, score)
+        result = score()
+        cache.set(key, result)
         return result
         
     except Exception as e:
-        print(f"AI Scoring Failed: {e}")
-        # Fallback to a basic structure if AI fails, to prevent crash
-        return {
-            "overall_score": 0,
-            "breakdown": {"skill_match": 0, "experience_relevance": 0, "formatting": 0},
-            "missing_skills": ["Error in AI analysis"],
-            "summary": f"Could not compute score due to error: {str(e)}"
-        }
+        return _local_fallback(resume_data, job_data, e)
+
+
+def compute_ats_score_stream(
+    client, resume_data: dict, job_data: dict, use_cache: bool = True
+) -> Iterator[dict]:
+    """
+    Streaming variant of compute_ats_score: yields the result built so
+    far each time a top-level field (``overall_score``, ``breakdown``,
+    ``missing_skills``, ``summary``) has been generated and validated, so
+    the score can be shown before the summary is written. The last dict
+    yielded is the final result; a cached one is yielded in one piece.
+
+    On a failed request, a malformed field or a truncated object the last
+    yield is the local fallback (with ``error``), as in compute_ats_score.
+    """
+    resume_text = resume_data.get("text", "")
+    job_text = job_data.get("raw_text", "")
+
+    cache = get_default_cache()
+    key = make_key(MODEL, PROMPT_VERSION, resume_text, job_text)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    def open_stream():
+        return stream_completion(
+            client,
+            stage="ats",
+            messages=_build_messages(resume_text, job_text),
+            response_format={"type": "json_object"}
+        )
+
+    # Concurrent identical requests share one upstream stream
+    deltas = cache.shared_stream(key, open_stream) if use_cache else open_stream()
+
+    parser = JSONObjectStream()
+    partial: Dict[str, Any] = {}
+    try:
+        for delta in deltas:
+            fields = parser.feed(delta)
+            for field, value in fields:
+                partial[field] = validate_ats_field(field, value)
+            if fields:
+                yield dict(partial)
+        result = validate_ats_result(parser.close())
+    except Exception as e:
+        yield _local_fallback(resume_data, job_data, e)
+        return
+
+    cache.set(key, result)
+    if result != partial:
+        yield result
+
@@ -0,0 +1,260 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from resume_parser import parse_resume, read_pdf_bytes
+from job_parser import parse_job_description
+from skill_analyzer import analyze_skill_distribution
+from fit_reasoning import analyze_fit
+from skill_matcher import DEFAULT_MATCHER, SKILL_TAXONOMY
+
+
+# -------------------------------
+# Vocabulary (fixed column order)
+# -------------------------------
+SKILLS: List[str] = list(DEFAULT_MATCHER.skill_domains)
+SKILL_INDEX: Dict[str, int] = {skill: i for i, skill in enumerate(SKILLS)}
+DOMAINS: List[str] = list(SKILL_TAXONOMY)
+
+FIT_BONUS = {
+    "ALIGNED": 1.0,
+    "PARTIALLY ALIGNED": 0.5,
+    "MISALIGNED": 0.0,
+    "INSUFFICIENT DATA": 0.0,
+}
+
+# Weights of the final 0-100 score
+SKILL_WEIGHT = 0.6
+DOMAIN_WEIGHT = 0.25
+FIT_WEIGHT = 0.15
+
+
+# -------------------------------
+# Input helpers
+# -------------------------------
+def iter_resume_files(directory: str) -> Iterator[str]:
+    """
+    Yield every PDF below ``directory`` in a stable order.
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(root, name)
+
+
+def _screen_one(item, job_dist: Dict[str, float], job_category: str) -> Dict:
+    """
+    Parse one resume and run the local analysis chain on it.
+    ``item`` is a path or a (name, file-like) pair.
+    Only small per-candidate fields are kept (no resume text).
+    """
+    if isinstance(item, tuple):
+        name, source = item
+    else:
+        name, source = str(item), str(item)
+
+    try:
+        resume = parse_resume(source)
+    except Exception as e:
+        return {"name": name, "error": str(e)}
+
+    if not resume["text"]:
+        return {"name": name, "error": "No extractable text"}
+
+    resume_dist = analyze_skill_distribution(resume["skills"])
+    fit = analyze_fit(resume_dist, job_dist, job_category)
+
+    return {
+        "name": name,
+        "skills": resume["skills"],
+        "distribution": resume_dist,
+        "classification": fit["classification"],
+    }
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _picklable(item):
+    """
+    (name, file-like) pairs cannot be sent to worker processes; send
+    their bytes instead. Paths are passed through.
+    """
+    if isinstance(item, tuple):
+        name, source = item
+        return name, read_pdf_bytes(source)
+    return item
+
+
+# -------------------------------
+# Vectorized scoring
+# -------------------------------
+def _job_vectors(job_data: dict, job_dist: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    skill_vec = np.zeros(len(SKILLS), dtype=np.float64)
+    for skill_list in job_data["skills"].values():
+        for skill in skill_list:
+            skill_vec[SKILL_INDEX[skill]] = 1.0
+
+    domain_vec = np.array([job_dist.get(d, 0.0) for d in DOMAINS], dtype=np.float64)
+    return skill_vec, domain_vec
+
+
+def _score_chunk(rows: List[Dict], skill_vec: np.ndarray, domain_vec: np.ndarray) -> np.ndarray:
+    """
+    Score a chunk of parsed resumes at once over a resume x skill
+    incidence matrix and a resume x domain distribution matrix.
+    """
+    incidence = np.zeros((len(rows), len(SKILLS)), dtype=np.float64)
+    dists = np.zeros((len(rows), len(DOMAINS)), dtype=np.float64)
+    fit = np.zeros(len(rows), dtype=np.float64)
+
+    for i, row in enumerate(rows):
+        for skill_list in row["skills"].values():
+            incidence[i, [SKILL_INDEX[s] for s in skill_list]] = 1.0
+        for j, domain in enumerate(DOMAINS):
+            dists[i, j] = row["distribution"].get(domain, 0.0)
+        fit[i] = FIT_BONUS.get(row["classification"], 0.0)
+
+    required = skill_vec.sum()
+    coverage = incidence @ skill_vec / required if required else np.zeros(len(rows))
+
+    norms = np.linalg.norm(dists, axis=1) * np.linalg.norm(domain_vec)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        domain_sim = np.where(norms > 0, dists @ domain_vec / norms, 0.0)
+
+    score = SKILL_WEIGHT * coverage + DOMAIN_WEIGHT * domain_sim + FIT_WEIGHT * fit
+    return np.round(score * 100, 1)
+
+
+# -------------------------------
+# MAIN: Batch screening
+# -------------------------------
+def iter_screening(
+    job_text: str,
+    resumes: Iterable,
+    chunk_size: int = 256,
+    workers: int = 1,
+) -> Iterator[Dict]:
+    """
+    Stream per-resume results (name, score, matched/missing skills,
+    classification) for one JD. Resumes are parsed and scored chunk
+    by chunk, so memory stays bounded by ``chunk_size``.
+    Failed resumes are yielded with an ``error`` field and no score.
+    """
+    job_data = parse_job_description(job_text)
+    job_dist = analyze_skill_distribution(job_data["skills"])
+    skill_vec, domain_vec = _job_vectors(job_data, job_dist)
+    job_skills = {s for skills in job_data["skills"].values() for s in skills}
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for chunk in _chunks(resumes, chunk_size):
+            if executor:
+                chunk = [_picklable(item) for item in chunk]
+                parsed = list(executor.map(
+                    _screen_one, chunk,
+                    [job_dist] * len(chunk), [job_data["category"]] * len(chunk),
+                ))
+            else:
+                parsed = [_screen_one(item, job_dist, job_data["category"]) for item in chunk]
+
+            rows = [row for row in parsed if "error" not in row]
+            scores = _score_chunk(rows, skill_vec, domain_vec) if rows else []
+
+            for row, score in zip(rows, scores):
+                resume_skills = {s for skills in row["skills"].values() for s in skills}
+                yield {
+                    "name": row["name"],
+                    "score": float(score),
+                    "classification": row["classification"],
+                    "matched_skills": sorted(resume_skills & job_skills),
+                    "missing_skills": sorted(job_skills - resume_skills),
+                }
+
+            for row in parsed:
+                if "error" in row:
+                    yield row
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def screen_resumes(
+    job_text: str,
+    resumes: Iterable,
+    top_k: int = 50,
+    chunk_size: int = 256,
+    workers: int = 1,
+) -> Dict:
+    """
+    Rank many resumes against one JD and keep only a bounded top-k
+    shortlist (min-heap), plus processed / failed counters.
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be at least 1, got {top_k}")
+
+    heap: List[Tuple[float, int, Dict]] = []
+    processed = failed = 0
+
+    for seq, result in enumerate(iter_screening(job_text, resumes, chunk_size, workers)):
+        if "error" in result:
+            failed += 1
+            continue
+
+        processed += 1
+        entry = (result["score"], -seq, result)
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    shortlist = [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+    return {"shortlist": shortlist, "processed": processed, "failed": failed}
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rank a directory of resume PDFs against one job description.")
+    parser.add_argument("job_description", help="Path to a text file with the job description")
+    parser.add_argument("resume_dir", help="Directory containing resume PDFs (searched recursively)")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=1, help="Parser processes (default: 1)")
+    args = parser.parse_args(argv)
+    if args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+
+    with open(args.job_description, encoding="utf-8") as f:
+        job_text = f.read()
+
+    result = screen_resumes(
+        job_text,
+        iter_resume_files(args.resume_dir),
+        top_k=args.top_k,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
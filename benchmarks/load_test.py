@@ -0,0 +1,139 @@
+"""
+Offline load test of the LLM-backed flows against a synthetic or replayed
+endpoint (see llm_transport.py); no network or API key needed.
+
+    python benchmarks/load_test.py --users 16 --iterations 5 --profile groq
+    LLM_CASSETTE=cassette.jsonl python benchmarks/load_test.py --transport replay
+
+Each simulated user runs the Analyze pipeline, then a cover letter and one
+chatbot question, with the LLM caches bypassed (identical concurrent
+requests are only coalesced with ``--coalesce``). Reports per-operation
+latency percentiles, end-to-end throughput and errors.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_pdf, synthetic_job_description, synthetic_resume_pages  # noqa: E402
+from benchmarks.run_benchmarks import _percentile  # noqa: E402
+
+
+def _user(client, pdf_bytes: bytes, jd: str, iterations: int, timings: Dict[str, List[float]], lock,
+          coalesce: bool = False) -> int:
+    from analysis_pipeline import run_analysis
+    from chatbot import Chatbot
+    from cover_letter_generator import generate_cover_letter
+
+    errors = 0
+    for _ in range(iterations):
+        chatbot = Chatbot(client)
+        steps = {}
+        try:
+            start = time.perf_counter()
+            result = run_analysis(client, io.BytesIO(pdf_bytes), jd)
+            steps["analyze"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            # The cache itself is disabled; use_cache only decides whether
+            # identical in-flight letters may be coalesced
+            generate_cover_letter(client, result["resume_data"]["text"], jd, use_cache=coalesce)
+            steps["cover_letter"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            chatbot.ask_question("How can I improve my fit?", context=result)
+            steps["chat"] = time.perf_counter() - start
+        except Exception as e:
+            print(f"[LoadTest] user error: {e}", file=sys.stderr)
+            errors += 1
+        with lock:
+            for name, seconds in steps.items():
+                timings.setdefault(name, []).append(seconds)
+    return errors
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline load test of the LLM-backed flows.")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=3, help="Flows per user")
+    parser.add_argument("--transport", default="synthetic", choices=["synthetic", "replay"])
+    parser.add_argument("--profile", default=None, help="Synthetic profile name or JSON (overrides LLM_SYNTHETIC_PROFILE)")
+    parser.add_argument("--coalesce", action="store_true",
+                        help="Let identical concurrent requests share one upstream call")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Must be set before the client is created
+    os.environ["LLM_TRANSPORT"] = args.transport
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ["LLM_COALESCE"] = "1" if args.coalesce else "0"
+    if args.profile:
+        os.environ["LLM_SYNTHETIC_PROFILE"] = args.profile
+
+    from llm_client import get_client
+
+    client = get_client("offline")
+    pdf_bytes = make_pdf(synthetic_resume_pages(2, seed=7))
+    jd = synthetic_job_description(400, seed=7)
+
+    timings: Dict[str, List[float]] = {}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [
+            pool.submit(_user, client, pdf_bytes, jd, args.iterations, timings, lock, args.coalesce)
+            for _ in range(args.users)
+        ]
+        errors = sum(f.result() for f in futures)
+    elapsed = time.perf_counter() - started
+
+    from llm_cache import get_default_cache
+    from model_router import ROUTER
+
+    flows = args.users * args.iterations
+    report = {
+        "transport": args.transport,
+        "users": args.users,
+        "flows": flows,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "flows_per_sec": round((flows - errors) / elapsed, 3),
+        "operations": {
+            name: {
+                "count": len(samples),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 1),
+                "p95_ms": round(_percentile(samples, 95) * 1000, 1),
+                "max_ms": round(max(samples) * 1000, 1),
+            }
+            for name, samples in timings.items()
+        },
+        "models": ROUTER.stats(),
+        "coalesced": get_default_cache().flights.stats()["collapsed"],
+    }
+
+    print(f"{flows} flows by {args.users} users in {elapsed:.2f}s "
+          f"({report['flows_per_sec']} flows/s, {errors} errors, {report['coalesced']} calls coalesced)")
+    print(f"{'operation':<14} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for name, r in report["operations"].items():
+        print(f"{name:<14} {r['count']:>6} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['max_ms']:>10.1f}")
+    print(f"{'model':<26} {'requests':>9} {'errors':>7} {'timeouts':>9} {'p95 ms':>10}")
+    for model, m in report["models"].items():
+        print(f"{model:<26} {m['requests']:>9} {m['errors']:>7} {m['timeouts']:>9} {m['p95_ms'] or 0:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Micro-benchmarks for the local (non-LLM) analysis hot paths.
+
+    python benchmarks/run_benchmarks.py                 # run + compare with baseline
+    python benchmarks/run_benchmarks.py --save-baseline # record a new baseline
+
+Exits with status 1 when a case is slower (p50) or uses more peak memory
+than the stored baseline beyond the given tolerances, or when there is
+no baseline to compare with.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_pdf, synthetic_job_description, synthetic_resume_pages  # noqa: E402
+from resume_parser import PARALLEL_PAGE_THRESHOLD, extract_skills, extract_text_from_pdf  # noqa: E402
+from job_parser import parse_job_description  # noqa: E402
+from skill_analyzer import analyze_skill_distribution  # noqa: E402
+from fit_reasoning import analyze_fit  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (resume pages, JD words) per size
+SIZES = {
+    "small": (1, 150),
+    "medium": (3, 600),
+    "large": (20, 2000),
+    # Above the threshold, so PDF extraction takes the process-pool path
+    "xlarge": (PARALLEL_PAGE_THRESHOLD + 8, 4000),
+}
+
+
+# -------------------------------
+# Case definitions
+# -------------------------------
+def build_cases() -> Dict[str, Callable[[], object]]:
+    cases: Dict[str, Callable[[], object]] = {}
+    for size, (pages, jd_words) in SIZES.items():
+        pdf_bytes = make_pdf(synthetic_resume_pages(pages, seed=pages))
+        text = extract_text_from_pdf(io.BytesIO(pdf_bytes))
+        jd = synthetic_job_description(jd_words, seed=jd_words)
+        skills = extract_skills(text)
+        job = parse_job_description(jd)
+        resume_dist = analyze_skill_distribution(skills)
+        job_dist = analyze_skill_distribution(job["skills"])
+
+        cases[f"extract_text_from_pdf[{size}]"] = lambda b=pdf_bytes: extract_text_from_pdf(io.BytesIO(b))
+        cases[f"extract_skills[{size}]"] = lambda t=text: extract_skills(t)
+        cases[f"parse_job_description[{size}]"] = lambda j=jd: parse_job_description(j)
+        cases[f"analyze_skill_distribution[{size}]"] = lambda s=skills: analyze_skill_distribution(s)
+        cases[f"analyze_fit[{size}]"] = (
+            lambda r=resume_dist, j=job_dist, c=job["category"]: analyze_fit(r, j, c)
+        )
+    return cases
+
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+
+    gc.collect()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    # Peak memory in a separate run so tracing does not skew timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 4),
+        "ops_per_sec": round(iterations / total, 1) if total else 0.0,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: Dict,
+    baseline: Dict,
+    time_tolerance: float,
+    memory_tolerance: float,
+    min_delta_ms: float = 0.2,
+) -> List[str]:
+    """
+    Cases slower than the baseline by more than ``time_tolerance`` (and by
+    at least ``min_delta_ms``, to ignore timer noise on tiny cases) or with
+    peak memory above ``memory_tolerance``.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        slower = current["p50_ms"] - base["p50_ms"]
+        if current["p50_ms"] > base["p50_ms"] * (1 + time_tolerance) and slower >= min_delta_ms:
+            regressions.append(
+                f"{name}: p50 {current['p50_ms']:.3f}ms vs baseline {base['p50_ms']:.3f}ms"
+            )
+        if current["peak_kb"] > base["peak_kb"] * (1 + memory_tolerance) + 64:
+            regressions.append(
+                f"{name}: peak {current['peak_kb']:.0f}KB vs baseline {base['peak_kb']:.0f}KB"
+            )
+    return regressions
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the local analysis hot paths.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--filter", default="", help="Only run cases containing this substring")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.2, help="Ignore p50 slowdowns smaller than this")
+    parser.add_argument("--memory-tolerance", type=float, default=0.5, help="Allowed peak memory growth")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<42} {'p50 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'peak KB':>10}")
+    for name, fn in build_cases().items():
+        if args.filter not in name:
+            continue
+        r = results[name] = measure(fn, args.iterations)
+        print(f"{name:<42} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['ops_per_sec']:>10.1f} {r['peak_kb']:>10.1f}")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "cases": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["cases"]
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance, args.min_delta_ms)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
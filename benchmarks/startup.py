@@ -0,0 +1,134 @@
+"""
+Cold-start import-time report for the app and its modules.
+
+    python benchmarks/startup.py                   # report + check the budget
+    python benchmarks/startup.py --budget-ms 600 --top 15
+
+Each module is imported in a fresh interpreter with ``-X importtime``
+(best of ``--repeat`` runs). Exits with status 1 when a module's
+cumulative import time exceeds its budget.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> cold-start budget (ms). ``app`` runs the Streamlit script in
+# bare mode, so it includes importing streamlit itself.
+BUDGETS_MS: Dict[str, float] = {
+    "app": 1500.0,
+    "analysis_pipeline": 150.0,
+    "chatbot": 50.0,
+    "llm_client": 50.0,
+    "resume_parser": 100.0,
+    "job_parser": 50.0,
+    "skill_matcher": 50.0,
+    "service": 300.0,
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    ``{name: (self_us, cumulative_us, depth)}`` for one cold import of
+    ``module``, restricted to the imports it triggered itself (not the
+    interpreter's own startup imports).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+
+    # importtime prints children before their parent, one level deeper
+    end = max(i for i, row in enumerate(rows) if row[0] == module)
+    depth = rows[end][3]
+    start = end
+    while start > 0 and rows[start - 1][3] > depth:
+        start -= 1
+    return {name: (self_us, cumulative_us, d) for name, self_us, cumulative_us, d in rows[start:end + 1]}
+
+
+def measure(module: str, repeat: int) -> Dict[str, Tuple[int, int, int]]:
+    runs = [import_times(module) for _ in range(repeat)]
+    return min(runs, key=lambda t: t[module][1])
+
+
+def heaviest(times: Dict[str, Tuple[int, int, int]], module: str, top: int) -> List[Tuple[str, int]]:
+    """
+    Largest direct/indirect dependencies by cumulative time, skipping
+    submodules of an already-listed package.
+    """
+    ranked = sorted(
+        ((name, cumulative) for name, (_, cumulative, _) in times.items() if name != module),
+        key=lambda item: -item[1],
+    )
+    picked: List[Tuple[str, int]] = []
+    for name, cumulative in ranked:
+        if any(name.startswith(p + ".") or p.startswith(name + ".") for p, _ in picked):
+            continue
+        picked.append((name, cumulative))
+        if len(picked) >= top:
+            break
+    return picked
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report cold-start import time per module.")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: all budgeted modules)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (best is kept)")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest dependencies to list per module")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Override every module budget")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or list(BUDGETS_MS)
+    report, over = {}, []
+    for module in modules:
+        times = measure(module, args.repeat)
+        total_ms = times[module][1] / 1000
+        budget = args.budget_ms if args.budget_ms is not None else BUDGETS_MS.get(module)
+        status = "" if budget is None else ("OVER" if total_ms > budget else "ok")
+        if status == "OVER":
+            over.append(module)
+
+        print(f"{module:<20} {total_ms:>9.1f} ms" + (f"  (budget {budget:.0f} ms, {status})" if budget else ""))
+        deps = heaviest(times, module, args.top)
+        for name, cumulative in deps:
+            print(f"    {name:<40} {cumulative / 1000:>9.1f} ms")
+        report[module] = {
+            "total_ms": round(total_ms, 1),
+            "budget_ms": budget,
+            "heaviest": {name: round(c / 1000, 1) for name, c in deps},
+        }
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if over:
+        print(f"\nOver budget: {', '.join(over)}")
+        return 1
+    print("\nAll modules within their cold-start budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
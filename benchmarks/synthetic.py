@@ -0,0 +1,90 @@
+import random
+from typing import List
+
+from skill_matcher import SKILL_TAXONOMY
+
+
+FILLER = (
+    "designed built maintained delivered improved team project customers "
+    "production service platform reliability performance stakeholders "
+    "requirements features release quality ownership mentoring reporting"
+).split()
+
+HEADINGS = ["Summary", "Experience", "Projects", "Education", "Skills"]
+
+ALL_SKILLS = [s for skills in SKILL_TAXONOMY.values() for s in skills]
+
+
+# -------------------------------
+# Text generators
+# -------------------------------
+def _words(rng: random.Random, n_words: int, skill_rate: float) -> List[str]:
+    words = []
+    while len(words) < n_words:
+        if rng.random() < skill_rate:
+            words.extend(rng.choice(ALL_SKILLS).split())
+        else:
+            words.append(rng.choice(FILLER))
+    return words[:n_words]
+
+
+def synthetic_resume_pages(n_pages: int, words_per_page: int = 400, seed: int = 0) -> List[str]:
+    """
+    Resume-like pages: headings, bullet lines, ~8% skill keywords.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for p in range(n_pages):
+        lines = [f"{HEADINGS[p % len(HEADINGS)]}", "jane doe - jane.doe@example.com"]
+        words = _words(rng, words_per_page, 0.08)
+        for i in range(0, len(words), 12):
+            lines.append("- " + " ".join(words[i:i + 12]))
+        pages.append("\n".join(lines))
+    return pages
+
+
+def synthetic_job_description(n_words: int = 300, seed: int = 0) -> str:
+    rng = random.Random(seed + 1000)
+    return "We are hiring. Requirements: " + " ".join(_words(rng, n_words, 0.12)) + "."
+
+
+# -------------------------------
+# Minimal PDF writer (Helvetica text, one content stream per page)
+# -------------------------------
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """
+    Build a small valid PDF whose pages contain the given text lines.
+    """
+    n = len(pages)
+    font_id = 3 + 2 * n
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n
+        ),
+    ]
+    for i, text in enumerate(pages):
+        ops = "BT /F1 9 Tf 40 760 Td 11 TL " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in text.split("\n")
+        ) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
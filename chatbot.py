@@ -1,44 +1,212 @@
+import hashlib
+from typing import Iterator, List
+
+from instrumentation import span
+from llm_client import estimate_tokens
+from llm_streaming import stream_completion
+from model_router import complete
+from session_store import TEXTS
+
+
+SYSTEM_INSTRUCTIONS = """You are an expert career coach and resume analyst helping a candidate improve their chances for a specific job.
+
+INSTRUCTIONS:
+- Answer the user's question directly and concisely.
+- Use the provided context to give specific, evidence-based advice.
+- If the user asks about the score or fit, explain it using the context.
+- Do not hallucinate skills or experience not present in the resume.
+- Keep the tone professional, encouraging, and actionable."""
+
+
 class Chatbot:
     """
     AI-powered career guidance chatbot using Groq (OpenAI Client).
+
+    The analysis context (JD, resume, ATS score, fit reasoning) is sent as
+    one system message, followed by the conversation turns. The bot only
+    holds TextStore handles to the resume and JD; the prefix is rebuilt
+    from them byte-identically for every turn so provider-side prompt
+    caching can reuse it. Once the turns exceed the context budget, the
+    oldest ones are folded into a rolling summary.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, context_budget_tokens: int = 8000, keep_recent_turns: int = 6):
         self.client = client
-        self.model = "llama-3.3-70b-versatile"
+        self.context_budget_tokens = context_budget_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.reset()
+
+    # ---------- session state ----------
+    def reset(self) -> None:
+        """
+        Forget the current analysis context and conversation.
+        """
+        self._release_context()
+        self._context_key = None
+        # (resume text key, JD text key, ATS score, fit reasoning)
+        self._context = None
+        self.summary = ""
+        self.turns: List[dict] = []
+
+    @staticmethod
+    def _fingerprint(context: dict) -> str:
+        h = hashlib.sha256()
+        for part in (
+            context["resume_data"].get("text", ""),
+            context["job_data"].get("raw_text", ""),
+            str(context["ats_result"]["overall_score"]),
+            context["fit_result"]["reasoning"],
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def start_session(self, context: dict) -> None:
+        """
+        Take shared handles on the context of a new analysis.
+        """
+        self.reset()
+        self._context_key = self._fingerprint(context)
 
-    def ask_question(self, question: str, context: dict) -> str:
-        
         # Unpacking context for clarity in the prompt
         resume_text = context["resume_data"].get("text", "No resume text available.")
         job_text = context["job_data"].get("raw_text", "No job description available.")
         ats_score = context["ats_result"]["overall_score"]
         fit_reasoning = context["fit_result"]["reasoning"]
-        
+
+        self._context = (TEXTS.put(resume_text), TEXTS.put(job_text), ats_score, fit_reasoning)
+
+    def _release_context(self) -> None:
+        context = getattr(self, "_context", None)
+        if context is not None:
+            TEXTS.release(context[0])
+            TEXTS.release(context[1])
+            self._context = None
+
+    def __del__(self):
+        self._release_context()
+
+    def _prefix(self) -> dict:
+        resume_key, job_key, ats_score, fit_reasoning = self._context
+        return {
+            "role": "system",
+            "content": (
+                f"{SYSTEM_INSTRUCTIONS}\n\n"
+                "CONTEXT:\n"
+                f"- Job Description: {TEXTS.get(job_key)}\n"
+                f"- Resume Content: {TEXTS.get(resume_key)}\n"
+                f"- Computed ATS Score: {ats_score}/100\n"
+                f"- System Fit Analysis: {fit_reasoning}"
+            ),
+        }
+
+    def approx_bytes(self) -> int:
+        """
+        Memory held by this bot: its share of the context texts plus the
+        summary and verbatim turns.
+        """
+        size = len(self.summary) + sum(len(t["content"]) + 64 for t in self.turns)
+        if self._context is not None:
+            size += TEXTS.share(self._context[0]) + TEXTS.share(self._context[1]) + len(self._context[3])
+        return size
+
+    def _ensure_session(self, context: dict) -> None:
+        if self._context is None or self._fingerprint(context) != self._context_key:
+            self.start_session(context)
+
+    def _build_messages(self, question: str) -> List[dict]:
+        messages = [self._prefix()]
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{self.summary}",
+            })
+        return messages + self.turns + [{"role": "user", "content": question}]
+
+    # ---------- context budget ----------
+    def _history_tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(estimate_tokens(t["content"]) for t in self.turns)
+
+    def _over_budget(self) -> bool:
+        prefix_tokens = estimate_tokens(self._prefix()["content"])
+        # Always leave room for a few turns even with a very long resume/JD
+        history_budget = max(1000, self.context_budget_tokens - prefix_tokens)
+        return self._history_tokens() > history_budget
+
+    def _compact(self) -> None:
+        """
+        Fold the oldest turns into the rolling summary until the history
+        fits the budget (the most recent turns are always kept verbatim).
+        """
+        if not self._over_budget() or len(self.turns) <= self.keep_recent_turns:
+            return
+
+        old = self.turns[:-self.keep_recent_turns]
+        self.turns = self.turns[-self.keep_recent_turns:]
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in old)
+
         prompt = f"""
-        You are an expert career coach and resume analyst helping a candidate improve their chances for a specific job.
-        
-        CONTEXT:
-        - Job Description: {job_text}
-        - Resume Content: {resume_text}
-        - Computed ATS Score: {ats_score}/100
-        - System Fit Analysis: {fit_reasoning}
-        
-        USER QUESTION: "{question}"
-        
-        INSTRUCTIONS:
-        - Answer the user's question directly and concisely.
-        - Use the provided context to give specific, evidence-based advice.
-        - If the user asks about the score or fit, explain it using the context.
-        - Do not hallucinate skills or experience not present in the resume.
-        - Keep the tone professional, encouraging, and actionable.
+        Update the running summary of a conversation between a job candidate and a career coach.
+
+        CURRENT SUMMARY:
+        {self.summary or "(none)"}
+
+        NEW TURNS:
+        {transcript}
+
+        Return ONLY the updated summary (max 150 words). Keep concrete facts,
+        advice already given and open questions; drop greetings and repetition.
         """
+        try:
+            with span("chat_summary"):
+                response = complete(
+                    self.client, "chat_summary",
+                    messages=[{"role": "user", "content": prompt}]
+                )
+            self.summary = response.choices[0].message.content.strip()
+        except Exception as e:
+            # Older turns are dropped rather than blowing the budget
+            print(f"[Chatbot] Summarization failed: {e}")
+
+    def _record_turn(self, question: str, answer: str) -> None:
+        self.turns.append({"role": "user", "content": question})
+        self.turns.append({"role": "assistant", "content": answer})
+        self._compact()
+
+    # ---------- public API ----------
+    def ask_question(self, question: str, context: dict) -> str:
+        self._ensure_session(context)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.choices[0].message.content
+            with span("chat"):
+                response = complete(
+                    self.client, "chat",
+                    messages=self._build_messages(question)
+                )
+            answer = response.choices[0].message.content
         except Exception as e:
             return f"I encountered an error: {str(e)}"
+
+        self._record_turn(question, answer)
+        return answer
+
+    def ask_question_stream(self, question: str, context: dict) -> Iterator[str]:
+        """
+        Streaming variant of ask_question: yields the answer chunk by chunk.
+        """
+        self._ensure_session(context)
+
+        parts = []
+        try:
+            for delta in stream_completion(
+                self.client,
+                stage="chat",
+                messages=self._build_messages(question)
+            ):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            yield f"I encountered an error: {str(e)}"
+            return
+
+        self._record_turn(question, "".join(parts))
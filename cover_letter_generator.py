@@ -1,7 +1,17 @@
-def generate_cover_letter(client, resume_text: str, job_text: str, tone: str = "Professional") -> str:
-    """
-    Generates a personalized cover letter using Groq (OpenAI Client).
-    """
+from typing import Iterator
+
+from instrumentation import span
+from llm_cache import get_default_cache, make_key
+from llm_streaming import stream_completion
+from model_router import complete, primary_model
+
+MODEL = primary_model("cover_letter")
+
+# Bump whenever the prompt below changes (invalidates cached letters)
+PROMPT_VERSION = "1"
+
+
+def _build_messages(resume_text: str, job_text: str, tone: str) -> list:
     prompt = f"""
     You are an expert career coach and professional writer.
     Write a compelling, personalized cover letter for the candidate based on their resume and the job description.
@@ -20,15 +30,76 @@ def generate_cover_letter(client, resume_text: str, job_text: str, tone: str = "
     5. Do not include placeholders like [Your Name] unless absolutely necessary; try to infer from resume or use generic placeholders.
     6. Output ONLY the body of the letter (and closing), no pre-text.
     """
+    return [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": prompt}
+    ]
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+
+def generate_cover_letter(
+    client, resume_text: str, job_text: str, tone: str = "Professional", use_cache: bool = True
+) -> str:
+    """
+    Generates a personalized cover letter using Groq (OpenAI Client).
+    Pass ``use_cache=False`` to force a fresh draft.
+    """
+    cache = get_default_cache()
+    key = make_key(MODEL, PROMPT_VERSION, resume_text, job_text, tone)
+
+    def write() -> str:
+        with span("cover_letter"):
+            response = complete(
+                client, "cover_letter",
+                messages=_build_messages(resume_text, job_text, tone)
+            )
         return response.choices[0].message.content
+
+    try:
+        if use_cache:
+            # Identical requests already in flight are joined, not repeated
+            return cache.get_or_compute(key, write)
+        letter = write()
+        cache.set(key, letter)
+        return letter
     except Exception as e:
         return f"Error generating cover letter: {str(e)}"
+
+
+def stream_cover_letter(
+    client, resume_text: str, job_text: str, tone: str = "Professional", use_cache: bool = True
+) -> Iterator[str]:
+    """
+    Streaming variant of generate_cover_letter: yields text chunks as the
+    model produces them. A cached letter is yielded in one piece; a fully
+    streamed letter is stored in the cache once complete. Callers asking
+    for the same letter at the same time share one upstream stream.
+    """
+    cache = get_default_cache()
+    key = make_key(MODEL, PROMPT_VERSION, resume_text, job_text, tone)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    def open_stream():
+        return stream_completion(
+            client,
+            stage="cover_letter",
+            messages=_build_messages(resume_text, job_text, tone)
+        )
+
+    # Concurrent identical requests share one upstream stream; a fresh
+    # draft (use_cache=False) always gets its own
+    deltas = cache.shared_stream(key, open_stream) if use_cache else open_stream()
+
+    parts = []
+    try:
+        for delta in deltas:
+            parts.append(delta)
+            yield delta
+    except Exception as e:
+        yield f"Error generating cover letter: {str(e)}"
+        return
+
+    cache.set(key, "".join(parts))
@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Optional
+
+from resume_parser import extract_skills, extract_text_from_pdf, read_pdf_bytes
+from skill_analyzer import analyze_skill_distribution
+from resume_store import ResumeStore
+from batch_screening import iter_resume_files
+
+
+# -------------------------------
+# Worker
+# -------------------------------
+def _parse_path(path: str) -> Dict:
+    """
+    Process-pool task: parse one PDF. Never raises; failures come back
+    as {"path", "error"}.
+    """
+    try:
+        data = read_pdf_bytes(path)
+        # Already inside a worker process: no nested page pool
+        text = extract_text_from_pdf(data, parallel=False)
+        if not text:
+            return {"path": path, "error": "No extractable text"}
+
+        skills = extract_skills(text)
+        return {
+            "path": path,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "text": text,
+            "skills": skills,
+            "distribution": analyze_skill_distribution(skills),
+        }
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+# -------------------------------
+# MAIN: resumable ingestion
+# -------------------------------
+def ingest(
+    directory: str,
+    store_path: str,
+    workers: int = 4,
+    batch_size: int = 200,
+    retry_failed: bool = False,
+    progress_every: float = 10.0,
+    limit: Optional[int] = None,
+) -> Dict:
+    """
+    Parse every PDF under ``directory`` into the ResumeStore at
+    ``store_path``. Results are committed in batches, and paths already
+    in the store are skipped, so a crashed run resumes where it stopped.
+    Only ``workers * 4`` documents are in flight at a time.
+    """
+    store = ResumeStore(store_path)
+    done = store.processed_paths(include_failures=not retry_failed)
+
+    pending = (p for p in iter_resume_files(directory) if p not in done)
+    parsed, failed = [], []
+    stats = {"parsed": 0, "failed": 0, "skipped": len(done)}
+    started = last_report = time.monotonic()
+
+    def flush():
+        store.add_batch(parsed, failed)
+        parsed.clear()
+        failed.clear()
+
+    def report(final=False):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        total = stats["parsed"] + stats["failed"]
+        print(
+            f"[Ingest] {'done' if final else 'progress'}: {total} docs in {elapsed:.1f}s "
+            f"({total / elapsed:.1f} docs/sec), {stats['failed']} failed, {stats['skipped']} skipped",
+            file=sys.stderr,
+        )
+
+    submitted = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < workers * 4:
+                if limit is not None and submitted >= limit:
+                    exhausted = True
+                    break
+                path = next(pending, None)
+                if path is None:
+                    exhausted = True
+                    break
+                in_flight.add(pool.submit(_parse_path, path))
+                submitted += 1
+
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                result = future.result()
+                if "error" in result:
+                    failed.append((result["path"], result["error"]))
+                    stats["failed"] += 1
+                else:
+                    parsed.append(result)
+                    stats["parsed"] += 1
+
+            if len(parsed) + len(failed) >= batch_size:
+                flush()
+
+            now = time.monotonic()
+            if now - last_report >= progress_every:
+                report()
+                last_report = now
+
+    flush()
+    report(final=True)
+
+    elapsed = max(time.monotonic() - started, 1e-9)
+    stats["docs_per_sec"] = round((stats["parsed"] + stats["failed"]) / elapsed, 2)
+    stats.update({f"store_{k}": v for k, v in store.count().items()})
+    store.close()
+    return stats
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-parse a resume PDF archive into a compact resume store.")
+    parser.add_argument("directory", help="Directory containing resume PDFs (searched recursively)")
+    parser.add_argument("store", help="Path of the SQLite resume store (created if missing)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=200, help="Documents per committed batch")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-attempt previously failed files")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many new documents")
+    args = parser.parse_args(argv)
+
+    stats = ingest(
+        args.directory,
+        args.store,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        retry_failed=args.retry_failed,
+        limit=args.limit,
+    )
+    print(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
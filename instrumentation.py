@@ -0,0 +1,228 @@
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Off unless RESUME_ANALYZER_METRICS=1; when off, span() returns a shared
+# no-op object and record_* return immediately.
+_enabled = os.environ.get("RESUME_ANALYZER_METRICS", "") in ("1", "true", "yes")
+
+# Latency buckets (seconds), Prometheus-style cumulative on export
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], list] = {}   # [bucket counts..., +Inf count, sum]
+_gauges: Dict[Tuple[str, Labels], float] = {}
+_local = threading.local()
+
+
+def set_enabled(flag: bool) -> None:
+    global _enabled
+    _enabled = bool(flag)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# -------------------------------
+# Recording
+# -------------------------------
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    if not _enabled:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if not _enabled:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        hist[bisect.bisect_left(BUCKETS, value)] += 1
+        hist[-1] += value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    if not _enabled:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        _gauges[key] = float(value)
+
+
+def current_stage() -> str:
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else "unknown"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _local.stack.pop()
+        observe("stage_duration_seconds", elapsed, stage=self.name)
+        if exc_type is not None:
+            inc("stage_errors_total", stage=self.name)
+        return False
+
+
+def span(name: str):
+    """
+    Time a pipeline stage: ``with span("parse_resume"): ...``.
+    LLM calls made inside are attributed to the innermost span.
+    """
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def record_completion(
+    model: str,
+    stage: str,
+    latency: float,
+    usage=None,
+    error: Optional[str] = None,
+    first_token: Optional[float] = None,
+) -> None:
+    """
+    Record one chat completion: latency, token usage (``response.usage``)
+    and errors, labelled by model and calling stage.
+    """
+    if not _enabled:
+        return
+    inc("llm_requests_total", model=model, stage=stage)
+    observe("llm_latency_seconds", latency, model=model, stage=stage)
+    if first_token is not None:
+        observe("llm_time_to_first_token_seconds", first_token, model=model, stage=stage)
+    if error:
+        inc("llm_errors_total", model=model, stage=stage, error=error)
+    if usage is not None:
+        inc("llm_prompt_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, model=model, stage=stage)
+        inc("llm_completion_tokens_total", getattr(usage, "completion_tokens", 0) or 0, model=model, stage=stage)
+
+
+# -------------------------------
+# Export
+# -------------------------------
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _gauges.clear()
+
+
+def snapshot() -> Dict:
+    """
+    JSON-serializable view: counters, gauges, and histograms with count /
+    sum / mean plus approximate p50 and p95 from the buckets.
+    """
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    def approx(counts, total, q):
+        target = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+    out = {"counters": [], "gauges": [], "histograms": []}
+    for (name, labels), value in sorted(counters.items()):
+        out["counters"].append({"name": name, "labels": dict(labels), "value": value})
+    for (name, labels), value in sorted(gauges.items()):
+        out["gauges"].append({"name": name, "labels": dict(labels), "value": value})
+    for (name, labels), hist in sorted(histograms.items()):
+        counts, total_sum = hist[:-1], hist[-1]
+        count = sum(counts)
+        out["histograms"].append({
+            "name": name,
+            "labels": dict(labels),
+            "count": count,
+            "sum": round(total_sum, 6),
+            "mean": round(total_sum / count, 6) if count else 0.0,
+            "p50_le": approx(counts, count, 0.5),
+            "p95_le": approx(counts, count, 0.95),
+        })
+    return out
+
+
+def render_json() -> str:
+    return json.dumps(snapshot(), indent=2)
+
+
+def _fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    """
+    Prometheus text exposition format (counters, gauges and cumulative
+    histograms).
+    """
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    lines = []
+    for kind, values in (("counter", counters), ("gauge", gauges)):
+        for name in sorted({n for n, _ in values}):
+            lines.append(f"# TYPE {name} {kind}")
+            for (n, labels), value in sorted(values.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+
+    for name in sorted({n for n, _ in histograms}):
+        lines.append(f"# TYPE {name} histogram")
+        for (n, labels), hist in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), hist[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {hist[-1]:.6f}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -1,20 +1,119 @@
+from typing import Iterator, Optional
+
+from instrumentation import span
+from llm_client import estimate_tokens
+from llm_streaming import stream_completion
+from model_router import complete
+
+
+def _format_messages(messages: list, with_feedback: bool = False) -> str:
+    lines = []
+    for msg in messages:
+        lines.append(f"{msg['role']}: {msg['content']}")
+        if with_feedback and msg.get("feedback"):
+            lines.append(f"feedback: {msg['feedback']}")
+    return "\n".join(lines)
+
+
+class InterviewMemory:
+    """
+    Bounded view of the interview history for prompts.
+
+    Recent question/answer pairs (at least ``keep_exchanges``) are kept
+    verbatim; everything older is folded, incrementally, into a running
+    summary. Folding also kicks in early when the rendered history would
+    exceed ``max_tokens``, so prompt size stays flat for long sessions.
+    """
+
+    def __init__(self, client, keep_exchanges: int = 4, max_tokens: int = 1500):
+        self.client = client
+        self.keep_exchanges = keep_exchanges
+        self.max_tokens = max_tokens
+        self.reset()
+
+    def reset(self) -> None:
+        self.summary = ""
+        self._folded = 0                    # history messages already in the summary
+        self._anchor: Optional[str] = None  # first question, detects a restarted interview
+
+    def render(self, history: list) -> str:
+        anchor = history[0]["content"] if history else None
+        if len(history) < self._folded or (self._folded and anchor != self._anchor):
+            self.reset()
+        self._anchor = anchor
+
+        # Fold in batches (once the verbatim window has doubled) so the
+        # summary costs one extra call every ``keep_exchanges`` turns
+        keep = 2 * self.keep_exchanges
+        fold_until = self._folded
+        if len(history) - self._folded > 2 * keep:
+            fold_until = len(history) - keep
+        while (
+            fold_until < len(history) - 2
+            and estimate_tokens(self.summary) + estimate_tokens(_format_messages(history[fold_until:])) > self.max_tokens
+        ):
+            fold_until += 2
+
+        if fold_until > self._folded:
+            self._fold(history[self._folded:fold_until])
+            self._folded = fold_until
+
+        recent = _format_messages(history[self._folded:])
+        if not self.summary:
+            return recent
+        return f"Summary of earlier questions and answers:\n{self.summary}\n\nMost recent exchanges:\n{recent}"
+
+    def _fold(self, messages: list) -> None:
+        prompt = f"""
+        Update the running summary of a mock job interview.
+
+        CURRENT SUMMARY:
+        {self.summary or "(none)"}
+
+        NEW EXCHANGES:
+        {_format_messages(messages, with_feedback=True)}
+
+        Return ONLY the updated summary (max 120 words): topics already asked,
+        and the candidate's demonstrated strengths and weaknesses.
+        """
+        try:
+            with span("interview_summary"):
+                response = complete(
+                    self.client, "interview_summary",
+                    messages=[{"role": "user", "content": prompt}]
+                )
+            self.summary = response.choices[0].message.content.strip()
+        except Exception:
+            # Keep at least the topics already covered so questions don't repeat
+            asked = [m["content"][:80] for m in messages if m["role"] == "assistant"]
+            self.summary = "\n".join(filter(None, [self.summary] + [f"- Asked: {q}" for q in asked]))
+
+        # The summary itself must not outgrow the ceiling
+        max_chars = self.max_tokens * 2
+        if len(self.summary) > max_chars:
+            self.summary = self.summary[-max_chars:]
+
+
 class InterviewBot:
     """
     AI Interviewer that conducts a mock interview using Groq (OpenAI Client).
     """
-    def __init__(self, client):
+    def __init__(self, client, keep_exchanges: int = 4, history_max_tokens: int = 1500):
         self.client = client
-        self.model = "llama-3.3-70b-versatile"
+        self.memory = InterviewMemory(client, keep_exchanges, history_max_tokens)
 
-    def generate_question(self, job_description: str, history: list) -> str:
+    def reset(self) -> None:
         """
-        Generates the next interview question based on history.
+        Forget the interview so far (same protocol as Chatbot.reset).
         """
-        history_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in history])
-        
-        prompt = f"""
+        self.memory.reset()
+
+    def _question_prompt(self, job_description: str, history: list) -> str:
+        history_text = self.memory.render(history)
+
+        return f"""
         You are a professional Hiring Manager conducting a technical interview.
-        
+
         JOB DESCRIPTION:
         {job_description}
 
@@ -28,34 +127,73 @@ class InterviewBot:
         - Keep it professional and challenging.
         - ONLY output the question.
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.choices[0].message.content
-        except Exception:
-            return "Could you tell me more about your experience with this role?"
 
-    def evaluate_answer(self, question: str, answer: str) -> str:
-        """
-        Provides feedback on the candidate's answer.
-        """
-        prompt = f"""
+    def _feedback_prompt(self, question: str, answer: str) -> str:
+        return f"""
         You are an Interview Coach.
         Evaluate the candidate's answer to the question: "{question}"
         Candidate's Answer: "{answer}"
-        
+
         Provide concise, constructive feedback on:
         1. Clarity
         2. Relevance
         3. Quality of content
         """
+
+    def generate_question(self, job_description: str, history: list) -> str:
+        """
+        Generates the next interview question based on history.
+        """
+        prompt = self._question_prompt(job_description, history)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            with span("interview_question"):
+                response = complete(
+                    self.client, "interview_question",
+                    messages=[{"role": "user", "content": prompt}]
+                )
+            return response.choices[0].message.content
+        except Exception:
+            return "Could you tell me more about your experience with this role?"
+
+    def generate_question_stream(self, job_description: str, history: list) -> Iterator[str]:
+        """
+        Streaming variant of generate_question.
+        """
+        prompt = self._question_prompt(job_description, history)
+        try:
+            yield from stream_completion(
+                self.client,
+                stage="interview_question",
                 messages=[{"role": "user", "content": prompt}]
             )
+        except Exception:
+            yield "Could you tell me more about your experience with this role?"
+
+    def evaluate_answer(self, question: str, answer: str) -> str:
+        """
+        Provides feedback on the candidate's answer.
+        """
+        prompt = self._feedback_prompt(question, answer)
+        try:
+            with span("interview_feedback"):
+                response = complete(
+                    self.client, "interview_feedback",
+                    messages=[{"role": "user", "content": prompt}]
+                )
             return response.choices[0].message.content
         except Exception:
             return "Good answer, let's move on."
+
+    def evaluate_answer_stream(self, question: str, answer: str) -> Iterator[str]:
+        """
+        Streaming variant of evaluate_answer.
+        """
+        prompt = self._feedback_prompt(question, answer)
+        try:
+            yield from stream_completion(
+                self.client,
+                stage="interview_feedback",
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except Exception:
+            yield "Good answer, let's move on."
@@ -0,0 +1,348 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from job_parser import parse_job_description
+from skill_analyzer import analyze_skill_distribution
+from batch_screening import DOMAINS, SKILL_INDEX, SKILLS
+
+
+# Hashed text features (no fitted vocabulary, so postings can be added
+# without re-vectorizing the corpus)
+N_FEATURES = 2 ** 18
+
+# Weights of the combined score
+TEXT_WEIGHT = 0.4
+SKILL_WEIGHT = 0.4
+DOMAIN_WEIGHT = 0.2
+
+# Re-weight the whole corpus with fresh IDF once it grew by this fraction
+# since the last fit; rows added in between use the previous IDF
+IDF_REFIT_GROWTH = 0.2
+
+_VECTORIZER = HashingVectorizer(
+    n_features=N_FEATURES,
+    stop_words="english",
+    ngram_range=(1, 2),
+    alternate_sign=False,
+    norm=None,
+    dtype=np.float32,
+)
+
+
+def _tf(texts: List[str]) -> sp.csr_matrix:
+    matrix = _VECTORIZER.transform(texts).tocsr()
+    np.log1p(matrix.data, out=matrix.data)          # sublinear tf
+    return matrix
+
+
+def _normalize_rows(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags(1.0 / norms) @ matrix, dtype=np.float32)
+
+
+def _skill_row(skills: Dict[str, List[str]]) -> List[int]:
+    return sorted({SKILL_INDEX[s] for skill_list in skills.values() for s in skill_list if s in SKILL_INDEX})
+
+
+def _domain_vector(distribution: Dict[str, float]) -> np.ndarray:
+    vec = np.array([distribution.get(d, 0.0) for d in DOMAINS], dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# -------------------------------
+# Job index
+# -------------------------------
+class JobIndex:
+    """
+    Precomputed matrices over a job-posting corpus, one row per posting:
+    - text:   hashed TF-IDF (sublinear tf, L2-normalized rows)
+    - skills: binary posting x skill incidence
+    - domain: L2-normalized analyze_skill_distribution vectors
+    A resume is scored against every posting with three sparse/dense
+    matrix-vector products and the top k are picked with argpartition.
+
+    New postings are appended in chunks that are stacked lazily on the
+    next query; re-adding an id replaces the old posting. Document
+    frequencies always cover the live postings only.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.categories: List[str] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._rows: Dict[str, int] = {}
+        self._retired: List[int] = []       # dead rows whose df is not yet subtracted
+
+        self._df = np.zeros(N_FEATURES, dtype=np.int64)
+        self._idf = np.ones(N_FEATURES, dtype=np.float32)
+        self._fitted_docs = 0
+
+        # Stacked matrices + chunks waiting to be stacked
+        self._tf = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._text = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._skills = sp.csr_matrix((0, len(SKILLS)), dtype=np.float32)
+        self._domains = np.zeros((0, len(DOMAINS)), dtype=np.float32)
+        self._pending: List[Tuple[sp.csr_matrix, sp.csr_matrix, sp.csr_matrix, np.ndarray]] = []
+
+        self._skill_counts = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ---------- updates ----------
+    def add(self, job_id: str, text: str) -> None:
+        self.add_many([(job_id, text)])
+
+    def add_many(self, postings: Iterable[Tuple[str, str]], batch_size: int = 2000) -> int:
+        """
+        Parse and index postings given as (id, text); returns how many
+        were added.
+        """
+        added = 0
+        batch: List[Tuple[str, str]] = []
+        for item in postings:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                added += self._add_batch(batch)
+                batch = []
+        if batch:
+            added += self._add_batch(batch)
+        return added
+
+    def _add_batch(self, batch: List[Tuple[str, str]]) -> int:
+        # An id repeated within the batch: its last posting wins
+        last = {job_id: i for i, (job_id, _) in enumerate(batch)}
+        if len(last) < len(batch):
+            batch = [batch[i] for i in sorted(last.values())]
+
+        parsed = [parse_job_description(text) for _, text in batch]
+
+        tf = _tf([job["raw_text"] for job in parsed])
+        self._df += np.bincount(tf.indices, minlength=N_FEATURES)
+
+        indptr, indices = [0], []
+        domains = np.zeros((len(batch), len(DOMAINS)), dtype=np.float32)
+        for i, job in enumerate(parsed):
+            cols = _skill_row(job["skills"])
+            indices.extend(cols)
+            indptr.append(len(indices))
+            domains[i] = _domain_vector(analyze_skill_distribution(job["skills"]))
+        skills = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(batch), len(SKILLS)),
+        )
+
+        self._alive = np.concatenate([self._alive, np.ones(len(batch), dtype=bool)])
+        for (job_id, _), job in zip(batch, parsed):
+            old = self._rows.get(job_id)
+            if old is not None:
+                self._retire(old)
+            self._rows[job_id] = len(self.ids)
+            self.ids.append(job_id)
+            self.categories.append(job["category"])
+
+        self._pending.append((tf, _normalize_rows(tf.multiply(self._idf).tocsr()), skills, domains))
+        return len(batch)
+
+    def remove(self, job_id: str) -> bool:
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return False
+        self._retire(row)
+        return True
+
+    def _retire(self, row: int) -> None:
+        # The row may still sit in a pending chunk; its df is subtracted
+        # on the next refresh, once it is stacked
+        self._alive[row] = False
+        self._retired.append(row)
+
+    def _refresh(self) -> None:
+        if self._pending:
+            tfs, texts, skills, domains = zip(*self._pending)
+            self._tf = sp.vstack([self._tf, *tfs], format="csr")
+            self._text = sp.vstack([self._text, *texts], format="csr")
+            self._skills = sp.vstack([self._skills, *skills], format="csr")
+            self._domains = np.vstack([self._domains, *domains])
+            self._skill_counts = np.asarray(self._skills.sum(axis=1), dtype=np.float32).ravel()
+            self._pending = []
+
+        if self._retired:
+            dead = self._tf[self._retired]
+            self._df -= np.bincount(dead.indices, minlength=N_FEATURES)
+            self._retired = []
+
+        # Refit once the live corpus grew or shrank by IDF_REFIT_GROWTH
+        n_docs = len(self._rows)
+        if n_docs and abs(n_docs - self._fitted_docs) > self._fitted_docs * IDF_REFIT_GROWTH:
+            self._idf = (np.log((1 + n_docs) / (1 + self._df)) + 1).astype(np.float32)
+            self._text = _normalize_rows(self._tf.multiply(self._idf).tocsr())
+            self._fitted_docs = n_docs
+
+    # ---------- queries ----------
+    def scores(self, resume_data: Dict) -> Dict[str, np.ndarray]:
+        """
+        Per-posting text / skill / domain similarities (0-1) and the
+        weighted combination, as arrays aligned with ``self.ids``.
+        """
+        self._refresh()
+
+        query_text = _normalize_rows(_tf([resume_data.get("text", "")]).multiply(self._idf).tocsr())
+        text = np.asarray((self._text @ query_text.T).todense()).ravel()
+
+        resume_skills = np.zeros(len(SKILLS), dtype=np.float32)
+        resume_skills[_skill_row(resume_data.get("skills", {}))] = 1.0
+        overlap = self._skills @ resume_skills
+        skill = np.divide(overlap, self._skill_counts, out=np.zeros_like(overlap), where=self._skill_counts > 0)
+
+        domain = self._domains @ _domain_vector(analyze_skill_distribution(resume_data.get("skills", {})))
+
+        total = TEXT_WEIGHT * text + SKILL_WEIGHT * skill + DOMAIN_WEIGHT * domain
+        total[~self._alive] = -np.inf
+        return {"total": total, "text": text, "skill": skill, "domain": domain}
+
+    def query(self, resume_data: Dict, k: int = 10, category: Optional[str] = None) -> List[Dict]:
+        """
+        Top-k postings for a parsed resume (``parse_resume`` output),
+        optionally restricted to one job category.
+        """
+        if not len(self):
+            return []
+        s = self.scores(resume_data)
+        total = s["total"]
+        if category is not None:
+            total = np.where(np.asarray(self.categories) == category, total, -np.inf)
+
+        k = min(k, int(np.isfinite(total).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-total, k - 1)[:k]
+        top = top[np.argsort(-total[top], kind="stable")]
+
+        resume_skills = set(_skill_row(resume_data.get("skills", {})))
+        results = []
+        for row in top:
+            job_skills = self._skills.indices[self._skills.indptr[row]:self._skills.indptr[row + 1]]
+            results.append({
+                "job_id": self.ids[row],
+                "category": self.categories[row],
+                "score": round(float(total[row]) * 100, 1),
+                "text_score": round(float(s["text"][row]) * 100, 1),
+                "skill_score": round(float(s["skill"][row]) * 100, 1),
+                "domain_score": round(float(s["domain"][row]) * 100, 1),
+                "matched_skills": sorted(SKILLS[c] for c in job_skills if c in resume_skills),
+                "missing_skills": sorted(SKILLS[c] for c in job_skills if c not in resume_skills),
+            })
+        return results
+
+    # ---------- persistence ----------
+    def save(self, directory: str) -> None:
+        self._refresh()
+        os.makedirs(directory, exist_ok=True)
+        sp.save_npz(os.path.join(directory, "tf.npz"), self._tf)
+        sp.save_npz(os.path.join(directory, "text.npz"), self._text)
+        sp.save_npz(os.path.join(directory, "skills.npz"), self._skills)
+        np.savez_compressed(
+            os.path.join(directory, "arrays.npz"),
+            domains=self._domains, df=self._df, idf=self._idf, alive=self._alive,
+        )
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "ids": self.ids,
+                "categories": self.categories,
+                "fitted_docs": self._fitted_docs,
+                "skills": SKILLS,
+                "domains": DOMAINS,
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "JobIndex":
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["skills"] != SKILLS or meta["domains"] != DOMAINS:
+            raise ValueError("Job index was built with a different skill taxonomy; rebuild it")
+
+        index = cls()
+        index.ids, index.categories = meta["ids"], meta["categories"]
+        index._fitted_docs = meta["fitted_docs"]
+        index._tf = sp.load_npz(os.path.join(directory, "tf.npz")).tocsr()
+        index._text = sp.load_npz(os.path.join(directory, "text.npz")).tocsr()
+        index._skills = sp.load_npz(os.path.join(directory, "skills.npz")).tocsr()
+        arrays = np.load(os.path.join(directory, "arrays.npz"))
+        index._domains, index._df = arrays["domains"], arrays["df"]
+        index._idf, index._alive = arrays["idf"], arrays["alive"]
+        index._skill_counts = np.asarray(index._skills.sum(axis=1), dtype=np.float32).ravel()
+        index._rows = {job_id: i for i, job_id in enumerate(index.ids) if index._alive[i]}
+        return index
+
+
+# -------------------------------
+# Corpus input
+# -------------------------------
+def iter_postings(source: str) -> Iterator[Tuple[str, str]]:
+    """
+    (id, text) pairs from a JSONL file ({"id": ..., "text": ...} per
+    line) or a directory of .txt files (id = relative path).
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".txt"):
+                    path = os.path.join(root, name)
+                    with open(path, encoding="utf-8", errors="ignore") as f:
+                        yield os.path.relpath(path, source), f.read()
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                posting = json.loads(line)
+                yield str(posting["id"]), posting["text"]
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query a job recommendation index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Index a corpus of job postings (adds to an existing index)")
+    build.add_argument("source", help="JSONL file (id, text) or directory of .txt postings")
+    build.add_argument("index", help="Index directory")
+
+    query = sub.add_parser("query", help="Best-matching postings for a resume PDF")
+    query.add_argument("index", help="Index directory")
+    query.add_argument("resume", help="Resume PDF")
+    query.add_argument("--top-k", type=int, default=10)
+    query.add_argument("--category", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        exists = os.path.exists(os.path.join(args.index, "meta.json"))
+        index = JobIndex.load(args.index) if exists else JobIndex()
+        added = index.add_many(iter_postings(args.source))
+        index.save(args.index)
+        print(f"Indexed {added} postings ({len(index)} total) into {args.index}", file=sys.stderr)
+        return 0
+
+    from resume_parser import parse_resume
+
+    index = JobIndex.load(args.index)
+    for match in index.query(parse_resume(args.resume), k=args.top_k, category=args.category):
+        print(json.dumps(match))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,14 @@
 import re
 from typing import Dict, List
 
+from skill_matcher import DEFAULT_MATCHER, SKILL_TAXONOMY
+
 
 # -------------------------------
 # Skill taxonomy (ATS-oriented)
 # -------------------------------
-SKILL_MAP: Dict[str, List[str]] = {
-    "Frontend": [
-        "html", "css", "javascript", "react", "angular", "vue",
-        "typescript", "ui", "ux"
-    ],
-    "Backend": [
-        "python", "java", "node", "express", "django", "flask",
-        "spring", "api", "microservices"
-    ],
-    "Data": [
-        "sql", "nosql", "data analysis", "data engineering",
-        "pandas", "numpy", "spark", "airflow", "etl",
-        "data warehouse", "big data"
-    ],
-    "Cloud": [
-        "aws", "azure", "gcp", "docker", "kubernetes",
-        "terraform", "ci/cd"
-    ],
-    "Security": [
-        "cybersecurity", "security", "penetration testing",
-        "siem", "soc", "nmap", "burp", "owasp",
-        "incident response", "threat detection", "malware"
-    ]
-}
+# Same taxonomy as resume_parser.SKILL_KEYWORDS (see skill_matcher)
+SKILL_MAP: Dict[str, List[str]] = SKILL_TAXONOMY
 
 
 # -------------------------------
@@ -63,21 +43,16 @@ def parse_job_description(text: str) -> dict:
     raw_text = text.strip()
     text_norm = _normalize(raw_text)
 
-    extracted_skills: Dict[str, List[str]] = {}
-
-    # -------- Skill extraction --------
-    for domain, skills in SKILL_MAP.items():
-        matched = [
-            skill for skill in skills
-            if re.search(rf"\b{re.escape(skill)}\b", text_norm)
-        ]
-        if matched:
-            extracted_skills[domain] = sorted(set(matched))
+    # -------- Skill extraction (single pass) --------
+    extracted_skills = DEFAULT_MATCHER.extract(text_norm)
 
     # -------- Category inference (weighted) --------
+    # Soft skills ("communication", "agile") appear in almost every JD,
+    # so they only decide the category when nothing technical matched.
     domain_scores = {
         domain: len(skills)
         for domain, skills in extracted_skills.items()
+        if domain != "General"
     }
 
     if domain_scores:
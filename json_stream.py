@@ -0,0 +1,99 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+class JSONObjectStream:
+    """
+    Incremental parser for one streamed JSON object. ``feed`` takes text
+    deltas as they arrive and returns the top-level ``(key, value)`` pairs
+    completed by that delta, so a field can be used before the rest of the
+    object has been generated.
+
+    Each character is scanned once; only the field currently being
+    generated is kept in the buffer. Text before the opening brace (e.g. a
+    Markdown code fence) is skipped.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0            # next character of _buf to scan
+        self._field_start = 0    # start of the current top-level member
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.done = False
+        self.fields: Dict[str, Any] = {}
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        if self.done or not text:
+            return []
+        self._buf += text
+        completed = []
+
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf):
+            ch = buf[pos]
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._field_start = pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._member(buf[self._field_start:pos]))
+                    self.done = True
+                    break
+            elif ch == "," and self._depth == 1:
+                completed.extend(self._member(buf[self._field_start:pos]))
+                self._field_start = pos + 1
+            pos += 1
+
+        # Drop everything before the member still being generated
+        keep = self._field_start if self._started else pos
+        self._buf = buf[keep:]
+        self._pos = pos - keep
+        self._field_start -= keep
+        return completed
+
+    def _member(self, segment: str) -> List[Tuple[str, Any]]:
+        if not segment.strip():
+            return []
+        member = json.loads("{" + segment + "}")
+        self.fields.update(member)
+        return list(member.items())
+
+    def close(self) -> Dict[str, Any]:
+        """
+        The complete object; raises ValueError if the stream ended early.
+        """
+        if not self.done:
+            raise ValueError("JSON object is incomplete")
+        return dict(self.fields)
+
+
+def iter_fields(chunks: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """
+    Yields the top-level ``(key, value)`` pairs of a streamed JSON object
+    as each one completes; raises ValueError if the object is truncated
+    or malformed.
+    """
+    parser = JSONObjectStream()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            break
+    parser.close()
@@ -0,0 +1,309 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from instrumentation import inc
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ai-resume-analyzer", "llm_cache.sqlite3"
+)
+
+
+# -------------------------------
+# Key helpers
+# -------------------------------
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so re-pasted but identical inputs share a key.
+    """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_key(model: str, prompt_version: str, *parts: str) -> str:
+    """
+    Cache key over (model, prompt version, normalized inputs...).
+    """
+    h = hashlib.sha256()
+    for part in (model, prompt_version) + tuple(normalize_text(p) for p in parts):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+# -------------------------------
+# Single-flight coalescing of identical in-flight calls
+# -------------------------------
+class _Flight:
+    __slots__ = ("cond", "done", "result", "error", "chunks", "followers")
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.done = False
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.chunks: List[Any] = []
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first
+    caller (the leader) runs the upstream call, callers arriving while it
+    is in flight wait and get the same result, exception or stream
+    chunks. Nothing is kept once the call completes; that is the cache's
+    job. Plain calls (``do``) and streams (``stream``) are separate flight
+    namespaces, so a stream never answers a plain call or vice versa.
+
+    Disabled with LLM_COALESCE=0 (e.g. to measure raw upstream load).
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("LLM_COALESCE", "1") not in ("0", "false", "no")
+        self._flights: Dict[Tuple[str, str], _Flight] = {}   # (kind, key)
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.collapsed = 0
+
+    def _join(self, key: Tuple[str, str]):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+                leader = True
+            else:
+                flight.followers += 1
+                self.collapsed += 1
+                leader = False
+        inc("llm_singleflight_total", role="leader" if leader else "follower")
+        return flight, leader
+
+    def _finish(self, key: Tuple[str, str], flight: _Flight, result=None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+        with flight.cond:
+            flight.result = result
+            flight.error = error
+            flight.done = True
+            flight.cond.notify_all()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        ``fn()`` once for all concurrent callers with ``key``. Followers
+        get a deep copy of the leader's result, or its exception.
+        """
+        if not self.enabled:
+            return fn()
+        key = ("do", key)
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, flight, error=e)
+                raise
+            self._finish(key, flight, result=result)
+            return result
+
+        with flight.cond:
+            while not flight.done:
+                flight.cond.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result)
+
+    def stream(self, key: str, open_stream: Callable[[], Iterable]) -> Iterator:
+        """
+        Chunks of ``open_stream()``, shared by all concurrent callers with
+        ``key``: followers replay what the leader has received so far,
+        then follow it live. If the leader stops reading early the
+        followers get an error instead of waiting forever.
+        """
+        if not self.enabled:
+            yield from open_stream()
+            return
+        key = ("stream", key)
+        flight, leader = self._join(key)
+        if leader:
+            error: Optional[BaseException] = RuntimeError("The shared stream was abandoned")
+            try:
+                for chunk in open_stream():
+                    with flight.cond:
+                        flight.chunks.append(chunk)
+                        flight.cond.notify_all()
+                    yield chunk
+                error = None
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._finish(key, flight, error=error)
+            return
+
+        i = 0
+        while True:
+            with flight.cond:
+                while i >= len(flight.chunks) and not flight.done:
+                    flight.cond.wait()
+                pending = flight.chunks[i:]
+                finished = flight.done
+            yield from pending
+            i += len(pending)
+            if finished and i >= len(flight.chunks):
+                break
+        if flight.error is not None:
+            raise flight.error
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"leaders": self.leaders, "collapsed": self.collapsed, "in_flight": len(self._flights)}
+
+
+# -------------------------------
+# SQLite-backed result cache
+# -------------------------------
+class LLMCache:
+    """
+    Persistent cache of LLM results in a local SQLite database (WAL mode,
+    safe for several Streamlit worker processes). Entries expire after
+    ``ttl_seconds``; past ``max_entries`` the least recently used rows
+    are dropped.
+
+    ``get_or_compute`` / ``shared_stream`` also coalesce identical misses
+    that are in flight at the same time (within this process), so one
+    upstream call serves every waiting session.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+    ):
+        self.path = path or os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = os.environ.get("LLM_CACHE_DISABLED", "") not in ("1", "true", "yes")
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.flights = SingleFlight()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache(accessed)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"[LLM Cache] Read failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._evict(conn, now)
+        except sqlite3.Error as e:
+            print(f"[LLM Cache] Write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for ``key``, or ``compute()`` run once for all
+        concurrent callers and stored. Exceptions are not cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        def leader():
+            # A call that finished between our miss and joining the flight
+            # has stored its result already
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            value = compute()
+            self.set(key, value)
+            return value
+
+        return self.flights.do(key, leader)
+
+    def shared_stream(self, key: str, open_stream: Callable[[], Iterable]) -> Iterator:
+        """
+        Chunks of ``open_stream()``; concurrent callers with the same key
+        share one upstream stream. Caching the assembled result is left
+        to the caller.
+        """
+        return self.flights.stream(key, open_stream)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, **self.flights.stats()}
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
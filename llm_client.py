@@ -0,0 +1,312 @@
+import os
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import instrumentation
+from llm_transport import is_offline, wrap_transport
+
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+XAI_BASE_URL = "https://api.x.ai/v1"
+
+# Defaults follow Groq's free-tier limits for llama-3.3-70b-versatile;
+# override per deployment through the environment.
+REQUESTS_PER_MINUTE = int(os.environ.get("LLM_REQUESTS_PER_MINUTE", "30"))
+TOKENS_PER_MINUTE = int(os.environ.get("LLM_TOKENS_PER_MINUTE", "12000"))
+MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "8"))
+MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "4"))
+
+# Completion budget assumed when a call does not pass max_tokens
+DEFAULT_COMPLETION_TOKENS = 1024
+
+
+def resolve_base_url(api_key: str) -> str:
+    return GROQ_BASE_URL if "gsk_" in api_key else XAI_BASE_URL
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token) for budgeting.
+    """
+    return max(1, len(text or "") // 4)
+
+
+def estimate_request_tokens(kwargs: dict) -> int:
+    prompt = sum(estimate_tokens(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+    return prompt + int(kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+# -------------------------------
+# Token bucket limiter
+# -------------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``per_minute / 60``
+    units per second. ``acquire`` blocks until enough units are available.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                wait = (amount - self._level) / self.rate
+            time.sleep(min(wait, 1.0))
+
+
+# -------------------------------
+# Retry policy
+# -------------------------------
+def _is_retryable(exc: Exception) -> bool:
+    # Only the live client raises openai exceptions, so it is loaded already
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(
+        exc, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+    ):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status in (408, 409, 429) or (status is not None and status >= 500)
+
+
+def is_timeout(exc: Exception) -> bool:
+    return getattr(exc, "status_code", None) == 408 or "timeout" in type(exc).__name__.lower()
+
+
+def _retry_delay(exc: Exception, attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
+    """
+    Server-provided Retry-After when present, else exponential backoff
+    with full jitter.
+    """
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after is not None:
+            return min(cap, float(retry_after))
+    except ValueError:
+        pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_local = threading.local()
+
+
+@contextmanager
+def fail_fast():
+    """
+    Within this block LLMClient makes one attempt per request and does not
+    retry 429/5xx errors; for callers that have a fallback of their own
+    (e.g. the model router trying the next model).
+    """
+    previous = getattr(_local, "fail_fast", False)
+    _local.fail_fast = True
+    try:
+        yield
+    finally:
+        _local.fail_fast = previous
+
+
+# -------------------------------
+# Managed client
+# -------------------------------
+class _Completions:
+    def __init__(self, owner: "LLMClient"):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        return self._owner._create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, owner: "LLMClient"):
+        self.completions = _Completions(owner)
+
+
+class LLMClient:
+    """
+    Drop-in wrapper around an OpenAI-compatible client. Every
+    ``chat.completions.create`` call goes through the shared request and
+    token buckets, a concurrency cap, and retries on 429/5xx/connection
+    errors. Other attributes are forwarded to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        inner,
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = TOKENS_PER_MINUTE,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self._inner = inner
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.chat = _Chat(self)
+
+    def __getattr__(self, name):
+        if name == "_inner":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+    def _create(self, **kwargs):
+        tokens = estimate_request_tokens(kwargs)
+        model = kwargs.get("model", "unknown")
+        stage = instrumentation.current_stage()
+        max_retries = 0 if getattr(_local, "fail_fast", False) else self.max_retries
+        attempt = 0
+        while True:
+            self._requests.acquire(1)
+            self._tokens.acquire(tokens)
+            self._slots.acquire()
+            start = time.perf_counter()
+            try:
+                result = self._inner.chat.completions.create(**kwargs)
+            except Exception as e:
+                self._slots.release()
+                # A per-request timeout is the caller's latency budget (the
+                # model router falls back to another model instead)
+                retry = (
+                    attempt < max_retries and _is_retryable(e)
+                    and not (kwargs.get("timeout") and is_timeout(e))
+                )
+                instrumentation.record_completion(
+                    model, stage, time.perf_counter() - start, error=type(e).__name__
+                )
+                if not retry:
+                    raise
+                instrumentation.inc("llm_retries_total", model=model, stage=stage)
+                time.sleep(_retry_delay(e, attempt))
+                attempt += 1
+                continue
+
+            if kwargs.get("stream"):
+                # Hold the concurrency slot until the stream is drained or closed
+                def on_done(first_token, usage, start=start):
+                    self._slots.release()
+                    instrumentation.record_completion(
+                        model, stage, time.perf_counter() - start, usage=usage,
+                        first_token=first_token,
+                    )
+                return _StreamGuard(result, on_done, start)
+
+            self._slots.release()
+            instrumentation.record_completion(
+                model, stage, time.perf_counter() - start, usage=getattr(result, "usage", None)
+            )
+            return result
+
+
+class _StreamGuard:
+    """
+    Iterates a streamed completion and calls ``on_done(first_token, usage)``
+    exactly once when it is exhausted, closed, or garbage-collected unread.
+    """
+
+    def __init__(self, stream, on_done, start: float):
+        self._stream = stream
+        self._on_done = on_done
+        self._start = start
+        self._first_token: Optional[float] = None
+        self._usage = None
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator:
+        try:
+            for chunk in self._stream:
+                if self._first_token is None:
+                    self._first_token = time.perf_counter() - self._start
+                # OpenAI-style final usage chunk; Groq also reports it
+                # under x_groq on older API versions
+                usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if usage is not None:
+                    self._usage = usage
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+        self._on_done(self._first_token, self._usage)
+
+    def __del__(self):
+        self.close()
+
+
+# -------------------------------
+# Process-wide factory
+# -------------------------------
+# Clients kept for reuse (LRU); callers may pass arbitrary keys (e.g. a
+# service's X-API-Key header), so the cache must not grow without bound
+MAX_CLIENTS = 32
+
+_clients: "OrderedDict[Tuple[str, str], LLMClient]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str, base_url: Optional[str] = None) -> LLMClient:
+    """
+    Returns the shared client for (api_key, base_url), creating it on
+    first use. All sessions and modules using the same key share one
+    HTTP connection pool, rate limiter and concurrency cap. The least
+    recently used clients beyond MAX_CLIENTS are dropped from the cache
+    (their current holders keep working).
+    """
+    base_url = base_url or resolve_base_url(api_key)
+    key = (api_key, base_url)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if is_offline():
+                # LLM_TRANSPORT=replay/synthetic: no network, no key needed
+                inner = wrap_transport(None)
+            else:
+                # The SDK (~0.7s to import) is only loaded for a live client
+                import httpx
+                from openai import OpenAI
+
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONCURRENCY * 2,
+                        max_keepalive_connections=MAX_CONCURRENCY,
+                    ),
+                    timeout=httpx.Timeout(120.0, connect=10.0),
+                )
+                inner = wrap_transport(OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=http_client,
+                    max_retries=0,              # retries are handled by LLMClient
+                ))
+            client = LLMClient(inner)
+            _clients[key] = client
+            while len(_clients) > MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
@@ -0,0 +1,34 @@
+from typing import Iterator, Optional
+
+from instrumentation import span
+from model_router import complete
+
+
+def stream_completion(client, stage: Optional[str] = None, **kwargs) -> Iterator[str]:
+    """
+    Calls ``client.chat.completions.create`` with ``stream=True`` and yields
+    the text deltas as they arrive (empty keep-alive chunks are skipped).
+    ``stage`` names the instrumentation span the request is opened under;
+    the span covers opening the stream, not the caller consuming it.
+    Without an explicit ``model`` the request is routed by ``stage`` (see
+    model_router). Token usage is requested in the final chunk so
+    streamed calls are metered like plain ones.
+    """
+    kwargs.setdefault("stream_options", {"include_usage": True})
+    if "model" in kwargs:
+        create = client.chat.completions.create
+    else:
+        def create(**request):
+            return complete(client, stage, **request)
+
+    if stage:
+        with span(stage):
+            stream = create(stream=True, **kwargs)
+    else:
+        stream = create(stream=True, **kwargs)
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
@@ -0,0 +1,384 @@
+"""
+Pluggable stand-ins for the OpenAI client used by LLMClient, selected
+with ``LLM_TRANSPORT``:
+
+    live       real endpoint (default)
+    record     real endpoint, every completion appended to LLM_CASSETTE
+    replay     answers from LLM_CASSETTE only, no network
+    synthetic  generated answers with a latency/throughput/error profile
+               (LLM_SYNTHETIC_PROFILE: a name from PROFILES or a JSON object)
+
+Transports only implement ``chat.completions.create`` (plain and
+``stream=True``), which is all the feature modules use.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+
+
+DEFAULT_CASSETTE = os.path.join(
+    os.path.expanduser("~"), ".cache", "ai-resume-analyzer", "llm_cassette.jsonl"
+)
+
+# ttft: seconds to first token, tokens_per_second: decode speed,
+# completion_tokens: typical answer length, max_concurrency: requests the
+# fake server works on at once (others queue), error_rate: share of
+# requests failing with 503/429, models: per-model ttft/tokens_per_second
+# overrides (e.g. a small model answering faster).
+_FAST_MODELS = {"llama-3.1-8b-instant": {"ttft": 0.15, "tokens_per_second": 750}}
+
+PROFILES: Dict[str, Dict] = {
+    "instant": {"ttft": 0.0, "tokens_per_second": 0, "completion_tokens": 200,
+                "max_concurrency": 1000, "error_rate": 0.0},
+    "groq": {"ttft": 0.3, "tokens_per_second": 250, "completion_tokens": 300,
+             "max_concurrency": 64, "error_rate": 0.0, "models": _FAST_MODELS},
+    "slow": {"ttft": 2.0, "tokens_per_second": 30, "completion_tokens": 400,
+             "max_concurrency": 8, "error_rate": 0.0},
+    "flaky": {"ttft": 0.3, "tokens_per_second": 250, "completion_tokens": 300,
+              "max_concurrency": 64, "error_rate": 0.2, "models": _FAST_MODELS},
+}
+
+# Shape shared by the JSON prompts (ATS score and section refinement), so
+# json.loads callers get a well-formed answer in synthetic mode
+_SYNTHETIC_JSON = {
+    "overall_score": 72,
+    "breakdown": {"skill_match": 70, "experience_relevance": 75, "formatting": 80},
+    "missing_skills": ["kubernetes"],
+    "summary": "Synthetic response.",
+    "improvements": [
+        {"original": "Managed a team", "rewrite": "Led a team of 5 engineers.", "explanation": "Synthetic."}
+    ],
+}
+
+
+def transport_mode() -> str:
+    return os.environ.get("LLM_TRANSPORT", "live").strip().lower() or "live"
+
+
+def is_offline() -> bool:
+    """
+    True when completions never hit the network (no API key needed).
+    """
+    return transport_mode() in ("replay", "synthetic")
+
+
+def request_key(kwargs: Dict) -> str:
+    """
+    Identity of a request for recording: everything except the streaming
+    flags and timeout, so a streamed and a plain call share one recording.
+    """
+    payload = {k: v for k, v in kwargs.items() if k not in ("stream", "stream_options", "timeout")}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _tokens(text: str) -> int:
+    # Same ~4 characters per token heuristic as llm_client.estimate_tokens
+    return max(1, len(text or "") // 4)
+
+
+class TransportError(Exception):
+    """
+    Synthetic API failure; ``status_code`` makes LLMClient treat it like
+    the real 429/5xx responses.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = None
+
+
+class CassetteMiss(KeyError):
+    """
+    Replay mode received a request that was never recorded.
+    """
+
+
+# -------------------------------
+# Response objects (attribute-compatible with the openai SDK)
+# -------------------------------
+def _usage(prompt_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+def _completion(content: str, usage: SimpleNamespace, model: str) -> SimpleNamespace:
+    message = SimpleNamespace(role="assistant", content=content)
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+        usage=usage,
+    )
+
+
+def _chunk(delta: Optional[str], usage=None) -> SimpleNamespace:
+    choices = [] if delta is None else [SimpleNamespace(index=0, delta=SimpleNamespace(content=delta))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _split(content: str, size: int = 16) -> list:
+    return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+
+def _stream_usage(kwargs: Dict, usage):
+    # Like the real API, streams only report usage when asked to
+    return usage if (kwargs.get("stream_options") or {}).get("include_usage") else None
+
+
+def _paced_stream(content: str, usage, ttft: float, total: float) -> Iterator[SimpleNamespace]:
+    """
+    Yield ``content`` in small chunks, first after ``ttft`` seconds and the
+    rest spread evenly so the whole stream takes about ``total`` seconds;
+    a final chunk carries ``usage`` when it is given.
+    """
+    parts = _split(content)
+    if ttft > 0:
+        time.sleep(ttft)
+    gap = max(0.0, total - ttft) / len(parts)
+    for i, part in enumerate(parts):
+        if i and gap > 0:
+            time.sleep(gap)
+        yield _chunk(part)
+    if usage is not None:
+        yield _chunk(None, usage)
+
+
+class _Transport(ABC):
+    """
+    Exposes ``create`` as ``chat.completions.create``, like the OpenAI client.
+    """
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @abstractmethod
+    def create(self, **kwargs):
+        """
+        A completion (or, with ``stream=True``, an iterator of chunks).
+        """
+
+
+# -------------------------------
+# Cassette (JSONL, one completion per line)
+# -------------------------------
+class Cassette:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("LLM_CASSETTE") or DEFAULT_CASSETTE
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._entries.get(key)
+
+    def add(self, entry: Dict) -> None:
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class RecordingTransport(_Transport):
+    """
+    Passes requests to a real client and appends each finished completion
+    (content, usage, latency, time to first token) to the cassette.
+    """
+
+    def __init__(self, inner, cassette: Optional[Cassette] = None):
+        super().__init__()
+        self._inner = inner
+        self.cassette = cassette or Cassette()
+
+    def create(self, **kwargs):
+        key = request_key(kwargs)
+        model = kwargs.get("model", "")
+        start = time.perf_counter()
+        result = self._inner.chat.completions.create(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(result, key, model, start)
+
+        usage = getattr(result, "usage", None)
+        latency = time.perf_counter() - start
+        self.cassette.add({
+            "key": key,
+            "model": model,
+            "content": result.choices[0].message.content,
+            "usage": [getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0)],
+            "latency": round(latency, 4),
+            "ttft": round(latency, 4),
+        })
+        return result
+
+    def _record_stream(self, stream, key: str, model: str, start: float):
+        parts, usage, ttft = [], None, None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(chunk.choices[0].delta.content)
+            usage = getattr(chunk, "usage", None) or usage
+            yield chunk
+
+        content = "".join(parts)
+        latency = time.perf_counter() - start
+        self.cassette.add({
+            "key": key,
+            "model": model,
+            "content": content,
+            "usage": [getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0)]
+            if usage else [0, _tokens(content)],
+            "latency": round(latency, 4),
+            "ttft": round(ttft if ttft is not None else latency, 4),
+        })
+
+
+class ReplayTransport(_Transport):
+    """
+    Serves recorded completions. ``speed`` scales the recorded latency
+    (1.0 = as recorded, 0 = instant). Unrecorded requests raise
+    CassetteMiss, or go to ``fallback`` (e.g. a SyntheticTransport).
+    """
+
+    def __init__(self, cassette: Optional[Cassette] = None, speed: float = 1.0, fallback=None):
+        super().__init__()
+        self.cassette = cassette or Cassette()
+        self.speed = speed
+        self.fallback = fallback
+
+    def create(self, **kwargs):
+        key = request_key(kwargs)
+        entry = self.cassette.get(key)
+        if entry is None:
+            if self.fallback is not None:
+                return self.fallback.create(**kwargs)
+            raise CassetteMiss(f"No recorded completion for request {key[:12]} in {self.cassette.path}")
+
+        usage = _usage(*entry["usage"])
+        latency, ttft = entry["latency"] * self.speed, entry["ttft"] * self.speed
+        if kwargs.get("stream"):
+            return _paced_stream(entry["content"], _stream_usage(kwargs, usage), ttft, latency)
+        if latency > 0:
+            time.sleep(latency)
+        return _completion(entry["content"], usage, entry.get("model", ""))
+
+
+# -------------------------------
+# Synthetic endpoint
+# -------------------------------
+class SyntheticTransport(_Transport):
+    """
+    Fake endpoint with a latency / throughput / error profile:
+    time to first token ``ttft``, then ``completion_tokens`` decoded at
+    ``tokens_per_second`` (0 = instantly), at most ``max_concurrency``
+    requests served at once, and ``error_rate`` of requests failing with
+    503 or 429. Answers are deterministic per request and ``seed``.
+    A request ``timeout`` shorter than the simulated latency fails with
+    408 once it has elapsed.
+    """
+
+    def __init__(self, profile="groq", seed: int = 0, **overrides):
+        super().__init__()
+        settings = dict(PROFILES[profile] if isinstance(profile, str) else profile)
+        settings.update(overrides)
+        self.ttft = float(settings.get("ttft", 0.0))
+        self.tokens_per_second = float(settings.get("tokens_per_second", 0))
+        self.completion_tokens = int(settings.get("completion_tokens", 200))
+        self.error_rate = float(settings.get("error_rate", 0.0))
+        self.models = dict(settings.get("models") or {})
+        self._slots = threading.BoundedSemaphore(int(settings.get("max_concurrency", 64)))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.seed = seed
+
+    def _content(self, kwargs: Dict, key: str) -> str:
+        if (kwargs.get("response_format") or {}).get("type") == "json_object":
+            return json.dumps(_SYNTHETIC_JSON)
+        rng = random.Random(f"{self.seed}:{key}")
+        words = ["synthetic", "answer", "for", "load", "testing", "resume", "analysis", "candidate"]
+        n_words = max(1, int(self.completion_tokens * 0.75))
+        return " ".join(rng.choice(words) for _ in range(n_words)).capitalize() + "."
+
+    def create(self, **kwargs):
+        key = request_key(kwargs)
+        with self._lock:
+            fails = self._rng.random() < self.error_rate
+            status = self._rng.choice((429, 503))
+
+        model_settings = self.models.get(kwargs.get("model"), {})
+        ttft = float(model_settings.get("ttft", self.ttft))
+        tokens_per_second = float(model_settings.get("tokens_per_second", self.tokens_per_second))
+
+        prompt_tokens = sum(_tokens(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+        content = self._content(kwargs, key)
+        usage = _usage(prompt_tokens, _tokens(content))
+        decode = usage.completion_tokens / tokens_per_second if tokens_per_second else 0.0
+
+        if fails:
+            # Raised from create() itself, as the SDK does for stream=True too
+            with self._slots:
+                time.sleep(ttft)
+            raise TransportError(f"Synthetic {status} error", status)
+
+        # A stream has to produce its first token in time, a plain call all of it
+        timeout = kwargs.get("timeout")
+        latency = ttft if kwargs.get("stream") else ttft + decode
+        if timeout is not None and latency > timeout:
+            with self._slots:
+                time.sleep(timeout)
+            raise TransportError("Synthetic timeout", 408)
+
+        if kwargs.get("stream"):
+            return self._stream(content, _stream_usage(kwargs, usage), ttft, decode)
+
+        with self._slots:
+            time.sleep(ttft + decode)
+        return _completion(content, usage, kwargs.get("model", ""))
+
+    def _stream(self, content, usage, ttft, decode):
+        with self._slots:
+            yield from _paced_stream(content, usage, ttft, ttft + decode)
+
+
+# -------------------------------
+# Factory
+# -------------------------------
+def synthetic_profile_from_env():
+    raw = os.environ.get("LLM_SYNTHETIC_PROFILE", "groq").strip()
+    return json.loads(raw) if raw.startswith("{") else raw
+
+
+def wrap_transport(inner=None):
+    """
+    Returns the object LLMClient should call for the current
+    LLM_TRANSPORT mode; ``inner`` is the real client (unused offline).
+    """
+    mode = transport_mode()
+    if mode == "live":
+        return inner
+    if mode == "record":
+        return RecordingTransport(inner)
+    if mode == "replay":
+        speed = float(os.environ.get("LLM_REPLAY_SPEED", "1.0"))
+        fallback = SyntheticTransport(synthetic_profile_from_env()) if os.environ.get("LLM_REPLAY_FALLBACK") else None
+        return ReplayTransport(speed=speed, fallback=fallback)
+    if mode == "synthetic":
+        return SyntheticTransport(synthetic_profile_from_env())
+    raise ValueError(f"Unknown LLM_TRANSPORT {mode!r} (live, record, replay, synthetic)")
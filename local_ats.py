@@ -0,0 +1,124 @@
+import re
+from typing import Dict, List
+
+from job_parser import CRITICAL_SKILLS
+from skill_matcher import DEFAULT_MATCHER
+
+
+# Section headings a parser-friendly resume usually has
+SECTION_HEADINGS = ["experience", "education", "skills", "projects", "summary", "certifications"]
+
+# TF-IDF cosine at which experience relevance saturates at 100
+RELEVANCE_SATURATION = 0.5
+
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def _contains(term: str, text: str) -> bool:
+    return re.search(rf"(?<!\w){re.escape(term)}(?!\w)", text) is not None
+
+
+def _flatten(skills: Dict[str, List[str]]) -> set:
+    return {s for skill_list in skills.values() for s in skill_list}
+
+
+def _text_similarity(resume_text: str, job_text: str) -> float:
+    # scikit-learn costs over a second to import; load it on first score
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    try:
+        tfidf = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), sublinear_tf=True)
+        matrix = tfidf.fit_transform([resume_text, job_text])
+    except ValueError:                       # empty vocabulary
+        return 0.0
+    return float(cosine_similarity(matrix[0], matrix[1])[0, 0])
+
+
+def _formatting_score(resume_text: str) -> int:
+    """
+    Structure heuristics: length, standard sections, contact info, bullets.
+    """
+    words = len(resume_text.split())
+    if 300 <= words <= 1200:
+        length = 40
+    elif 150 <= words <= 2000:
+        length = 25
+    else:
+        length = 10
+
+    sections = sum(1 for h in SECTION_HEADINGS if _contains(h, resume_text))
+    section_score = min(40, sections * 10)
+    contact = 10 if re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", resume_text) else 0
+    bullets = 10 if re.search(r"(^|\s)[•\-\*▪●]\s", resume_text) else 0
+
+    return length + section_score + contact + bullets
+
+
+def critical_skill_gaps(resume_text: str, job_text: str) -> List[str]:
+    """
+    Critical skills (job_parser.CRITICAL_SKILLS) the JD asks for but the
+    resume never mentions.
+    """
+    gaps = []
+    for skills in CRITICAL_SKILLS.values():
+        for skill in skills:
+            if _contains(skill, job_text) and not _contains(skill, resume_text) and skill not in gaps:
+                gaps.append(skill)
+    return gaps
+
+
+# -------------------------------
+# MAIN: local ATS score
+# -------------------------------
+def compute_local_ats_score(resume_data: dict, job_data: dict) -> dict:
+    """
+    Deterministic, offline ATS estimate with the same schema as
+    ats_scoring.compute_ats_score:
+    - skill_match: share of JD skills found in the resume
+    - experience_relevance: TF-IDF cosine similarity of resume vs JD
+    - formatting: structural heuristics
+    Missing critical skills are listed first and cost up to 15 points.
+    """
+    resume_text = (resume_data.get("text") or "").lower()
+    job_text = (job_data.get("raw_text") or "").lower()
+
+    resume_skills = _flatten(resume_data.get("skills") or DEFAULT_MATCHER.extract(resume_text))
+    job_skills = _flatten(job_data.get("skills") or DEFAULT_MATCHER.extract(job_text))
+
+    similarity = _text_similarity(resume_text, job_text)
+    experience = round(min(1.0, similarity / RELEVANCE_SATURATION) * 100)
+
+    if job_skills:
+        skill_match = round(100 * len(resume_skills & job_skills) / len(job_skills))
+    else:
+        skill_match = experience
+
+    formatting = _formatting_score(resume_text)
+
+    critical = critical_skill_gaps(resume_text, job_text)
+    missing = critical + sorted(job_skills - resume_skills - set(critical))
+
+    overall = 0.5 * skill_match + 0.3 * experience + 0.2 * formatting
+    overall = max(0, round(overall - min(15, 3 * len(critical))))
+
+    matched = len(resume_skills & job_skills)
+    summary = (
+        f"Local estimate: {matched}/{len(job_skills)} job skills found in the resume, "
+        f"text similarity {similarity:.2f}."
+    )
+    if critical:
+        summary += f" Missing critical skills: {', '.join(critical)}."
+
+    return {
+        "overall_score": overall,
+        "breakdown": {
+            "skill_match": skill_match,
+            "experience_relevance": experience,
+            "formatting": formatting,
+        },
+        "missing_skills": missing,
+        "summary": summary,
+        "source": "local",
+    }
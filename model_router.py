@@ -0,0 +1,249 @@
+"""
+Per-task model routing for the LLM-backed features.
+
+Each task (the instrumentation stage names: ``ats``, ``chat``,
+``interview_feedback``, ...) has a policy:
+
+    tier              "quality" or "fast"; which model list to use
+    max_latency       seconds one attempt may take before the next model
+                      is tried (sent as the request ``timeout``)
+    max_input_tokens  "fast" tasks with a larger prompt are sent to the
+                      quality tier instead
+
+Quality-critical tasks (ATS, refinement, cover letters) stay on the large
+model; short conversational tasks go to a small, fast one and fall back
+to the large one on timeout or error. Models whose recent p95 latency
+exceeds the task budget, or that mostly fail, are skipped for a while.
+
+Overrides through the environment:
+    LLM_MODEL_QUALITY / LLM_MODEL_FAST   comma-separated model lists
+    LLM_ROUTES                           JSON, e.g. {"chat": {"tier": "quality"}}
+    LLM_ROUTING=off                      every task uses the first quality model
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import instrumentation
+from llm_client import estimate_tokens, fail_fast, is_timeout
+
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+FAST_MODEL = "llama-3.1-8b-instant"
+
+
+def _models_from_env(name: str, default: List[str]) -> List[str]:
+    raw = os.environ.get(name, "")
+    return [m.strip() for m in raw.split(",") if m.strip()] or default
+
+
+TIERS: Dict[str, List[str]] = {
+    "quality": _models_from_env("LLM_MODEL_QUALITY", [DEFAULT_MODEL]),
+    # The quality model is the fallback when the fast one is slow or failing
+    "fast": _models_from_env("LLM_MODEL_FAST", [FAST_MODEL, DEFAULT_MODEL]),
+}
+
+TASK_POLICIES: Dict[str, Dict] = {
+    "ats": {"tier": "quality", "max_latency": 60.0},
+    "refine": {"tier": "quality", "max_latency": 60.0},
+    "cover_letter": {"tier": "quality", "max_latency": 60.0},
+    "chat": {"tier": "fast", "max_latency": 15.0, "max_input_tokens": 6000},
+    "chat_summary": {"tier": "fast", "max_latency": 15.0, "max_input_tokens": 8000},
+    "interview_question": {"tier": "fast", "max_latency": 10.0, "max_input_tokens": 4000},
+    "interview_feedback": {"tier": "fast", "max_latency": 10.0, "max_input_tokens": 4000},
+    "interview_summary": {"tier": "fast", "max_latency": 15.0, "max_input_tokens": 4000},
+}
+
+# Unknown tasks are treated like quality-critical ones
+DEFAULT_POLICY = {"tier": "quality", "max_latency": 60.0}
+
+# Latency samples kept per model for the p95 used in routing
+WINDOW = 50
+
+# A model is only judged on at least this many recent samples
+MIN_SAMPLES = 5
+
+# A skipped model is tried again after this many seconds without samples
+PROBE_AFTER = 30.0
+
+
+def _policies_from_env() -> Dict[str, Dict]:
+    policies = {task: dict(policy) for task, policy in TASK_POLICIES.items()}
+    raw = os.environ.get("LLM_ROUTES", "").strip()
+    if not raw:
+        return policies
+    try:
+        overrides = json.loads(raw)
+        if not isinstance(overrides, dict) or not all(isinstance(o, dict) for o in overrides.values()):
+            raise ValueError("expected an object of task -> policy object")
+    except ValueError as e:
+        print(f"[Model Router] Ignoring invalid LLM_ROUTES ({e}); using the default routes")
+        return policies
+    for task, override in overrides.items():
+        policies[task] = {**policies.get(task, DEFAULT_POLICY), **override}
+    return policies
+
+
+class ModelStats:
+    """
+    Rolling latency / error record of one model.
+    """
+
+    def __init__(self, window: int = WINDOW):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self._failures: "deque[bool]" = deque(maxlen=window)
+        self.last_sample = 0.0
+
+    def record(self, latency: float, error: bool, timeout: bool) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        self.timeouts += int(timeout)
+        self._latencies.append(latency)
+        self._failures.append(error)
+        self.last_sample = time.monotonic()
+
+    def p95(self) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def healthy(self, max_latency: float) -> bool:
+        if len(self._latencies) < MIN_SAMPLES or time.monotonic() - self.last_sample > PROBE_AFTER:
+            return True
+        if sum(self._failures) * 2 > len(self._failures):
+            return False
+        return self.p95() <= max_latency
+
+    def summary(self) -> Dict:
+        p95 = self.p95()
+        ordered = sorted(self._latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class ModelRouter:
+    """
+    Picks the model for each task and runs the request, moving on to the
+    next candidate model when an attempt times out or fails.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, Dict]] = None, tiers: Optional[Dict[str, List[str]]] = None):
+        self.policies = policies if policies is not None else _policies_from_env()
+        self.tiers = tiers or TIERS
+        self.enabled = os.environ.get("LLM_ROUTING", "on").strip().lower() not in ("0", "off", "false", "no")
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def policy(self, task: str) -> Dict:
+        return self.policies.get(task, DEFAULT_POLICY)
+
+    def primary_model(self, task: str) -> str:
+        """
+        The model a task normally runs on (used e.g. in cache keys).
+        """
+        return self.candidates(task)[0]
+
+    def candidates(self, task: str, messages: Optional[list] = None) -> List[str]:
+        """
+        Models to try for ``task``, in order.
+        """
+        if not self.enabled:
+            return self.tiers["quality"][:1]
+        policy = self.policy(task)
+        tier = policy.get("tier", "quality")
+        limit = policy.get("max_input_tokens")
+        if tier != "quality" and limit and messages:
+            if sum(estimate_tokens(str(m.get("content", ""))) for m in messages) > limit:
+                tier = "quality"
+        return list(self.tiers.get(tier) or self.tiers["quality"])
+
+    def _model_stats(self, model: str) -> ModelStats:
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                stats = self._stats[model] = ModelStats()
+            return stats
+
+    def _record(self, model: str, latency: float, error: bool, timeout: bool) -> None:
+        stats = self._model_stats(model)
+        with self._lock:
+            stats.record(latency, error, timeout)
+
+    def create(self, client, task: str, **kwargs):
+        """
+        ``client.chat.completions.create`` for ``task`` with the routed
+        model (any ``model`` argument is replaced). For ``stream=True`` the
+        fallback covers opening the stream, not reading it. Attempts that
+        have a fallback are not retried on 429/5xx by the client; the next
+        model is tried instead.
+        """
+        policy = self.policy(task)
+        max_latency = policy.get("max_latency")
+        models = self.candidates(task, kwargs.get("messages"))
+
+        # Skip models that are currently too slow or failing, unless none is left
+        with self._lock:
+            usable = [m for m in models if self._stats.get(m) is None or self._stats[m].healthy(max_latency or float("inf"))]
+        if usable != models:
+            instrumentation.inc("llm_route_skips_total", len(models) - len(usable), task=task)
+        models = usable or models[-1:]
+
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            request = {**kwargs, "model": model}
+            if max_latency and not last:
+                # Only attempts that have a fallback get a hard latency budget
+                request["timeout"] = max_latency
+            start = time.perf_counter()
+            try:
+                if last:
+                    result = client.chat.completions.create(**request)
+                else:
+                    with fail_fast():
+                        result = client.chat.completions.create(**request)
+            except Exception as e:
+                timed_out = is_timeout(e)
+                self._record(model, time.perf_counter() - start, True, timed_out)
+                if last:
+                    raise
+                instrumentation.inc(
+                    "llm_fallbacks_total", task=task, model=model,
+                    reason="timeout" if timed_out else "error",
+                )
+                continue
+            self._record(model, time.perf_counter() - start, False, False)
+            return result
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Per-model request / error / timeout counts and p50 / p95 latency.
+        For streams the latency is the time to open the stream.
+        """
+        with self._lock:
+            return {model: stats.summary() for model, stats in self._stats.items()}
+
+
+ROUTER = ModelRouter()
+
+
+def primary_model(task: str) -> str:
+    return ROUTER.primary_model(task)
+
+
+def complete(client, task: str, **kwargs):
+    """
+    Routed ``chat.completions.create`` through the shared router.
+    """
+    return ROUTER.create(client, task, **kwargs)
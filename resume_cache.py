@@ -0,0 +1,205 @@
+import copy
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from instrumentation import inc
+from resume_parser import PARSER_VERSION, parse_resume, read_pdf_bytes
+from skill_matcher import TAXONOMY_VERSION
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "ai-resume-analyzer", "resumes"
+)
+
+
+# -------------------------------
+# Content-addressed resume cache
+# -------------------------------
+class ResumeCache:
+    """
+    Two-level cache for parsed resumes keyed by the PDF bytes hash plus
+    parser and taxonomy versions:
+    - in-memory LRU (per process)
+    - on-disk JSON store (shared by all worker processes)
+    The disk store is evicted oldest-first once it exceeds ``max_disk_bytes``.
+    Callers always get their own copy, so mutating a result never changes
+    the cached entry.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_memory_items: int = 128,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = directory or os.environ.get("RESUME_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- keys ----------
+    @staticmethod
+    def key_for(pdf_bytes: bytes) -> str:
+        h = hashlib.sha256(pdf_bytes)
+        h.update(f"|parser={PARSER_VERSION}|taxonomy={TAXONOMY_VERSION}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    # ---------- lookup ----------
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(self._memory[key])
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)                      # LRU order across processes
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, copy.deepcopy(value))
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            try:
+                replaced = os.path.getsize(path)    # overwriting an existing entry
+            except OSError:
+                replaced = 0
+            os.replace(tmp, path)               # atomic: readers never see partial files
+            size = os.path.getsize(path) - replaced
+        except OSError as e:
+            print(f"[Resume Cache] Disk write failed: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_size()
+            else:
+                self._disk_bytes += size
+            over = self._disk_bytes > self.max_disk_bytes
+
+        if over:
+            self._evict_disk()
+
+    def _remember(self, key: str, value: Dict) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # ---------- disk eviction ----------
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue                # removed by another process
+                    yield st.st_mtime, st.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict_disk(self) -> None:
+        """
+        Drop least recently used files until the store is back under 90% of the cap.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        removed = 0
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += removed
+
+    # ---------- stats ----------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+            }
+
+
+_default_cache: Optional[ResumeCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> ResumeCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResumeCache()
+        return _default_cache
+
+
+# -------------------------------
+# MAIN: cached parser
+# -------------------------------
+def cached_parse_resume(pdf_file, cache: Optional[ResumeCache] = None) -> Dict:
+    """
+    Drop-in replacement for parse_resume that skips PDF extraction for
+    bytes that were already parsed (by this or another worker process).
+    """
+    cache = cache or get_default_cache()
+    data = read_pdf_bytes(pdf_file)
+    key = cache.key_for(data)
+
+    cached = cache.get(key)
+    inc("resume_cache_requests_total", result="miss" if cached is None else "hit")
+    if cached is not None:
+        return cached
+
+    result = parse_resume(io.BytesIO(data))
+    if result["text"]:                          # don't pin failed extractions
+        cache.put(key, result)
+    return result
@@ -1,57 +1,169 @@
-import re
-from typing import Dict, List
-from PyPDF2 import PdfReader
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from instrumentation import span
+from skill_matcher import DEFAULT_MATCHER, SKILL_TAXONOMY
 
 # -------------------------------
 # Skill Keywords Dictionary
 # -------------------------------
-SKILL_KEYWORDS = {
-    "Frontend": [
-        "html", "css", "javascript", "react", "angular", "vue",
-        "bootstrap", "typescript", "responsive design", "ui/ux", "figma"
-    ],
-    "Backend": [
-        "python", "java", "nodejs", "express", "django", "flask",
-        "spring", "php", "c#", ".net", "api", "rest", "graphql",
-        "microservices"
-    ],
-    "Data": [
-        "sql", "mysql", "postgresql", "mongodb", "pandas", "numpy",
-        "machine learning", "data analysis", "spark", "etl",
-        "data warehouse", "power bi", "tableau"
-    ],
-    "Cloud": [
-        "aws", "azure", "gcp", "docker", "kubernetes",
-        "terraform", "ci/cd", "jenkins", "lambda", "s3"
-    ],
-    "Security": [
-        "cybersecurity", "penetration testing", "vulnerability assessment",
-        "siem", "ids", "ips", "incident response", "firewall", "encryption"
-    ],
-    "General": [
-        "git", "linux", "agile", "scrum", "problem solving",
-        "communication", "teamwork"
-    ],
-}
+# Shared with job_parser so resume and JD taxonomies never drift apart
+SKILL_KEYWORDS = SKILL_TAXONOMY
+
+# Bump whenever extraction output changes (invalidates cached parses)
+PARSER_VERSION = "2"
+
+# -------------------------------
+# Extraction limits
+# -------------------------------
+MAX_PDF_BYTES = 20 * 1024 * 1024   # larger uploads are rejected (and never read in full)
+MAX_PAGES = 50                     # pages beyond this are ignored
+MAX_TEXT_CHARS = 200_000           # extraction stops once this much text is collected
+
+# Documents with more pages than this are split across a process pool
+PARALLEL_PAGE_THRESHOLD = 32
+PAGES_PER_TASK = 16
+
+_pool = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+    return _pool
+
+
+# -------------------------------
+# Helper: read upload / path / file-like as bytes
+# -------------------------------
+def read_pdf_bytes(pdf_file, limit: Optional[int] = MAX_PDF_BYTES + 1) -> bytes:
+    """
+    Read at most ``limit`` bytes (None: everything). With the default
+    limit a result longer than MAX_PDF_BYTES means the file is too large;
+    extract_text_from_pdf rejects it without reading the rest.
+    """
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, "rb") as f:
+            return f.read(limit if limit is not None else -1)
+    if hasattr(pdf_file, "getbuffer"):         # Streamlit UploadedFile / BytesIO
+        with pdf_file.getbuffer() as view, view[:limit] as head:
+            return bytes(head)
+
+    pos = pdf_file.tell()
+    data = pdf_file.read(limit if limit is not None else -1)
+    pdf_file.seek(pos)
+    return data
+
 
 # -------------------------------
 # PDF Text Extraction
 # -------------------------------
-def extract_text_from_pdf(pdf_file) -> str:
+def _pdf_reader(source):
+    # PyPDF2 is imported on the first PDF, not when the module is imported
+    from PyPDF2 import PdfReader
+    return PdfReader(source)
+
+
+def iter_pdf_pages(pdf_file, max_pages: Optional[int] = MAX_PAGES) -> Iterator[str]:
+    """
+    Lazily yield the (lowercased) text of each page; pages are only
+    decoded when the consumer asks for them.
+    """
+    yield from _iter_reader_pages(_pdf_reader(pdf_file), max_pages)
+
+
+def _iter_reader_pages(reader, max_pages: Optional[int], lowercase: bool = True) -> Iterator[str]:
+    for i, page in enumerate(reader.pages):
+        if max_pages is not None and i >= max_pages:
+            break
+        page_text = page.extract_text()
+        if page_text:
+            yield page_text.lower() if lowercase else page_text
+
+
+def _page_range_pdf(reader, start: int, stop: int) -> bytes:
+    """
+    Pages [start, stop) as a PDF of their own, so each pool task is sent
+    its pages (plus the resources they use) rather than the whole file.
+    Copying pages is cheap next to extracting their text.
+    """
+    from PyPDF2 import PdfWriter
+    writer = PdfWriter()
+    for i in range(start, stop):
+        writer.add_page(reader.pages[i])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _extract_pages(data: bytes, lowercase: bool = True) -> List[str]:
+    """
+    Process-pool task: extract every page of a (partial) PDF.
+    """
+    return list(_iter_reader_pages(_pdf_reader(io.BytesIO(data)), None, lowercase))
+
+
+def _iter_pages_parallel(reader, page_count: int, lowercase: bool = True) -> Iterator[str]:
+    pool = _get_pool()
+    futures = [
+        pool.submit(_extract_pages, _page_range_pdf(reader, start, min(start + PAGES_PER_TASK, page_count)), lowercase)
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:             # early stop: drop work not started yet
+            future.cancel()
+
+
+def extract_text_from_pdf(
+    pdf_file,
+    max_pages: Optional[int] = MAX_PAGES,
+    max_chars: Optional[int] = MAX_TEXT_CHARS,
+    max_bytes: Optional[int] = MAX_PDF_BYTES,
+    parallel: bool = True,
+    lowercase: bool = True,
+) -> str:
     """
     Safely extract text from PDF.
     Always returns a string (never None).
+    Pages are streamed and extraction stops at ``max_pages`` / ``max_chars``;
+    long documents are fanned out to a process pool when ``parallel``.
+    With ``lowercase=False`` the original case and page breaks are kept
+    (for rewriting the resume rather than matching it).
     """
     try:
-        reader = PdfReader(pdf_file)
-        text_chunks = []
+        data = read_pdf_bytes(pdf_file, max_bytes + 1 if max_bytes is not None else None)
+        if max_bytes is not None and len(data) > max_bytes:
+            print(f"[Resume Parser] PDF too large (over {max_bytes} bytes), skipped")
+            return ""
+
+        reader = _pdf_reader(io.BytesIO(data))
+        page_count = len(reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
 
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_chunks.append(page_text)
+        if parallel and page_count > PARALLEL_PAGE_THRESHOLD:
+            pages = _iter_pages_parallel(reader, page_count, lowercase)
+        else:
+            pages = _iter_reader_pages(reader, page_count, lowercase)
 
-        return " ".join(text_chunks).lower()
+        text_chunks = []
+        collected = 0
+        for page_text in pages:
+            text_chunks.append(page_text)
+            collected += len(page_text) + 1
+            if max_chars is not None and collected >= max_chars:
+                break
+
+        text = (" " if lowercase else "\n").join(text_chunks)
+        return text[:max_chars] if max_chars is not None else text
 
     except Exception as e:
         print(f"[Resume Parser] PDF extraction failed: {e}")
@@ -63,23 +175,10 @@ def extract_text_from_pdf(pdf_file) -> str:
 # -------------------------------
 def extract_skills(text: str) -> Dict[str, List[str]]:
     """
-    Extract skills using keyword matching.
+    Extract skills using the shared single-pass keyword matcher.
     Returns ONLY domains with matched skills.
     """
-    skills_found: Dict[str, List[str]] = {}
-
-    for domain, keywords in SKILL_KEYWORDS.items():
-        matched = set()
-
-        for kw in keywords:
-            pattern = r"\b" + re.escape(kw) + r"\b"
-            if re.search(pattern, text, re.IGNORECASE):
-                matched.add(kw)
-
-        if matched:
-            skills_found[domain] = sorted(matched)
-
-    return skills_found
+    return DEFAULT_MATCHER.extract(text)
 
 
 # -------------------------------
@@ -94,8 +193,10 @@ def parse_resume(pdf_file) -> Dict:
         "skills": Dict[str, List[str]]
     }
     """
-    text = extract_text_from_pdf(pdf_file)
-    skills = extract_skills(text)
+    with span("extract_text"):
+        text = extract_text_from_pdf(pdf_file)
+    with span("extract_skills"):
+        skills = extract_skills(text)
 
     return {
         "text": text,        # ✅ REQUIRED for ATS similarity
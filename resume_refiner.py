@@ -1,6 +1,45 @@
+import hashlib
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 
-def refine_resume_section(client, section_text: str, job_description: str) -> dict:
+from instrumentation import inc, span
+from llm_cache import get_default_cache, make_key
+from model_router import complete, primary_model
+
+MODEL = primary_model("refine")
+
+# Bump whenever the prompt below changes (invalidates cached rewrites)
+PROMPT_VERSION = "1"
+
+# Bulk refinement: chunks refined at once across all sessions (the shared
+# LLM client still applies its own rate limits on top)
+MAX_WORKERS = 4
+
+# Upper bounds for one chunk sent to the model
+MAX_CHUNK_BULLETS = 6
+MAX_CHUNK_CHARS = 1500
+
+# A chunk also ends after a bullet whose hash is divisible by this, so
+# chunk boundaries follow the content: inserting or editing one bullet
+# only changes the chunk it lands in, the others stay cached
+BOUNDARY_MODULUS = 4
+
+SECTION_HEADINGS = {
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment history",
+    "projects", "personal projects", "education", "skills", "technical skills",
+    "certifications", "achievements", "awards", "publications", "leadership",
+    "volunteer experience", "activities", "internships",
+}
+
+_BULLET = re.compile(r"^\s*(?:[-*\u2022\u25aa\u25cf\u2013\u27a2\u25e6]|\d{1,2}[.)])\s+")
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="refine")
+
+
+def refine_resume_section(client, section_text: str, job_description: str, use_cache: bool = True) -> dict:
     """
     Rewrites a resume section to better match the job description.
     Returns JSON with original and rewritten bullet points.
@@ -30,15 +69,170 @@ def refine_resume_section(client, section_text: str, job_description: str) -> di
     }}
     """
     
+    cache = get_default_cache()
+    key = _cache_key(section_text, job_description)
+
+    def rewrite() -> dict:
+        with span("refine"):
+            response = complete(
+                client, "refine",
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            return json.loads(response.choices[0].message.content)
+
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+        if use_cache:
+            # Identical requests already in flight are joined, not repeated
+            return cache.get_or_compute(key, rewrite)
+        result = rewrite()
+        cache.set(key, result)
+        return result
     except Exception as e:
         return {"error": str(e)}
+
+
+def _cache_key(section_text: str, job_description: str) -> str:
+    return make_key(MODEL, PROMPT_VERSION, section_text, job_description)
+
+
+# -------------------------------
+# Bulk refinement
+# -------------------------------
+def _is_heading(line: str) -> bool:
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40 or _BULLET.match(line):
+        return False
+    return stripped.lower() in SECTION_HEADINGS or (stripped.isupper() and len(stripped.split()) <= 4)
+
+
+def split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Splits resume text into ``(heading, items)`` sections. An item is a
+    bullet (with its wrapped continuation lines) or a plain paragraph;
+    text before the first heading gets the heading "".
+    """
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    previous_blank = True
+    for line in text.splitlines():
+        if not line.strip():
+            previous_blank = True
+            continue
+        if _is_heading(line):
+            sections.append((line.strip().rstrip(":").strip(), []))
+            previous_blank = True
+            continue
+
+        items = sections[-1][1]
+        if items and not previous_blank and not _BULLET.match(line):
+            items[-1] = f"{items[-1]} {line.strip()}"
+        else:
+            items.append(line.strip())
+        previous_blank = False
+    return [(heading, items) for heading, items in sections if items]
+
+
+def _ends_chunk(item: str) -> bool:
+    digest = hashlib.sha1(item.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % BOUNDARY_MODULUS == 0
+
+
+def split_resume(
+    text: str,
+    max_bullets: int = MAX_CHUNK_BULLETS,
+    max_chars: int = MAX_CHUNK_CHARS,
+) -> List[Dict[str, str]]:
+    """
+    Splits a resume into chunks small enough for one quick completion:
+    ``[{"section", "text"}]`` in document order. A chunk never spans two
+    sections; within a section its boundaries depend on the bullets
+    themselves, so an edit re-sends only the affected chunk. The contact
+    block above the first heading is left out.
+    """
+    sections = split_sections(text)
+    if len(sections) > 1 and not sections[0][0]:
+        # Text above the first heading is the name / contact block
+        sections = sections[1:]
+
+    chunks = []
+    for heading, items in sections:
+        group: List[str] = []
+        size = 0
+        for item in items:
+            if group and (len(group) >= max_bullets or size + len(item) > max_chars):
+                chunks.append(_chunk(heading, group))
+                group, size = [], 0
+            group.append(item)
+            size += len(item) + 1
+            if _ends_chunk(item):
+                chunks.append(_chunk(heading, group))
+                group, size = [], 0
+        if group:
+            chunks.append(_chunk(heading, group))
+    return chunks
+
+
+def _chunk(heading: str, items: List[str]) -> Dict[str, str]:
+    body = "\n".join(items)
+    return {"section": heading, "text": f"{heading.upper()}\n{body}" if heading else body}
+
+
+def refine_resume(
+    client,
+    resume_text: str,
+    job_description: str,
+    use_cache: bool = True,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Refines a whole resume chunk by chunk (see split_resume). Cached
+    chunks are answered without a request, the rest are refined
+    concurrently on a bounded pool. ``improvements`` are merged in
+    document order, each tagged with its ``section``.
+
+    ``on_progress(done, total)`` is called from the calling thread as
+    chunks finish. Chunks that fail are listed under ``errors``; only if
+    every chunk fails is a plain ``{"error": ...}`` returned.
+    """
+    chunks = split_resume(resume_text)
+    if not chunks:
+        return {"error": "No resume text to refine."}
+
+    cache = get_default_cache()
+    results: List[Optional[dict]] = [None] * len(chunks)
+    pending = {}
+    for i, chunk in enumerate(chunks):
+        cached = cache.get(_cache_key(chunk["text"], job_description)) if use_cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            future = _executor.submit(refine_resume_section, client, chunk["text"], job_description, use_cache)
+            pending[future] = i
+
+    reused = len(chunks) - len(pending)
+    inc("refine_chunks_total", reused, result="cached")
+    inc("refine_chunks_total", len(pending), result="sent")
+
+    done = reused
+    if on_progress:
+        on_progress(done, len(chunks))
+    for future in as_completed(pending):
+        results[pending[future]] = future.result()
+        done += 1
+        if on_progress:
+            on_progress(done, len(chunks))
+
+    improvements, errors = [], []
+    for chunk, result in zip(chunks, results):
+        if "error" in result:
+            errors.append({"section": chunk["section"], "text": chunk["text"], "error": result["error"]})
+            continue
+        for item in result.get("improvements", []):
+            improvements.append({"section": chunk["section"], **item})
+
+    if errors and len(errors) == len(chunks):
+        return {"error": errors[0]["error"]}
+    return {"improvements": improvements, "errors": errors, "chunks": len(chunks), "reused": reused}
@@ -0,0 +1,113 @@
+import json
+import sqlite3
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+# -------------------------------
+# Compact on-disk store of parsed resumes
+# -------------------------------
+class ResumeStore:
+    """
+    SQLite store of parsed resumes: zlib-compressed text, skills and
+    domain distribution as JSON. Rows are keyed by source path, which
+    also serves as the ingestion checkpoint.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS resumes (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                sha256 TEXT NOT NULL,
+                text BLOB NOT NULL,
+                skills TEXT NOT NULL,
+                distribution TEXT NOT NULL,
+                parsed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS resumes_sha256 ON resumes(sha256);
+            CREATE TABLE IF NOT EXISTS failures (
+                path TEXT PRIMARY KEY,
+                error TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ---------- writes ----------
+    def add_batch(self, parsed: Iterable[Dict], failed: Iterable[Tuple[str, str]]) -> None:
+        """
+        Write one batch of results in a single transaction.
+        ``parsed`` items have path, sha256, text, skills, distribution.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO resumes (path, sha256, text, skills, distribution, parsed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        row["path"],
+                        row["sha256"],
+                        zlib.compress(row["text"].encode("utf-8"), 6),
+                        json.dumps(row["skills"], separators=(",", ":")),
+                        json.dumps(row["distribution"], separators=(",", ":")),
+                        now,
+                    )
+                    for row in parsed
+                ],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO failures (path, error, failed_at) VALUES (?, ?, ?)",
+                [(path, error, now) for path, error in failed],
+            )
+            self.conn.execute(
+                "DELETE FROM failures WHERE path IN (SELECT path FROM resumes WHERE parsed_at = ?)",
+                (now,),
+            )
+
+    # ---------- reads ----------
+    def processed_paths(self, include_failures: bool = True) -> Set[str]:
+        paths = {row[0] for row in self.conn.execute("SELECT path FROM resumes")}
+        if include_failures:
+            paths.update(row[0] for row in self.conn.execute("SELECT path FROM failures"))
+        return paths
+
+    def count(self) -> Dict[str, int]:
+        return {
+            "resumes": self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0],
+            "failures": self.conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0],
+        }
+
+    def iter_skills(self) -> Iterator[Tuple[int, str, Dict, Dict]]:
+        """
+        Yield (id, path, skills, distribution) without decompressing text.
+        """
+        for rid, path, skills, dist in self.conn.execute(
+            "SELECT id, path, skills, distribution FROM resumes ORDER BY id"
+        ):
+            yield rid, path, json.loads(skills), json.loads(dist)
+
+    def get(self, resume_id: int) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT path, sha256, text, skills, distribution FROM resumes WHERE id = ?",
+            (resume_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "path": row[0],
+            "sha256": row[1],
+            "text": zlib.decompress(row[2]).decode("utf-8"),
+            "skills": json.loads(row[3]),
+            "distribution": json.loads(row[4]),
+        }
@@ -0,0 +1,386 @@
+"""
+Headless HTTP/JSON service exposing the analysis operations without the
+Streamlit UI.
+
+    GROK_API_KEY=... python service.py --port 8080 --workers 8 --queue-size 32
+
+Requests are handled by a fixed worker pool; at most ``queue_size``
+accepted connections wait for a worker, beyond that the service answers
+503 with Retry-After instead of piling up threads.
+
+POST endpoints take a JSON body with ``resume_pdf`` (base64) or
+``resume_text``, plus ``job_description``:
+    /parse          resume_data and/or job_data
+    /fit            skill distributions + fit reasoning (local, no LLM)
+    /ats            ATS score (``"mode": "local"`` skips the LLM)
+    /analyze        full pipeline (same result as the Analyze button)
+    /cover-letter   ``tone`` optional
+    /refine         ``section_text`` + ``job_description``; without
+                    ``section_text`` the whole resume is refined in chunks
+GET endpoints: /healthz, /metrics (Prometheus text).
+"""
+import argparse
+import base64
+import binascii
+import io
+import json
+import os
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Dict, Optional
+
+import instrumentation
+from instrumentation import inc, span
+from analysis_pipeline import DEFAULT_TIMEOUTS, StageTimeout, run_analysis
+from resume_cache import cached_parse_resume
+from resume_parser import MAX_PDF_BYTES, extract_skills
+from job_parser import parse_job_description
+from skill_analyzer import analyze_skill_distribution
+from fit_reasoning import analyze_fit
+from ats_scoring import compute_ats_score
+from local_ats import compute_local_ats_score
+from cover_letter_generator import generate_cover_letter
+from resume_refiner import refine_resume, refine_resume_section
+from llm_client import get_client
+from llm_transport import is_offline
+
+
+# Base64 inflates the PDF by 4/3; leave room for the other fields
+MAX_BODY_BYTES = MAX_PDF_BYTES * 4 // 3 + 1024 * 1024
+
+# Seconds a connection may stay idle while sending its request
+SOCKET_TIMEOUT = 30
+
+# Upper bound for the per-stage ``timeouts`` a client may request
+MAX_STAGE_TIMEOUT = 120.0
+
+# Rejected connections answered politely (503) at once; past this many
+# the socket is simply closed
+MAX_PENDING_REJECTS = 64
+
+
+class BadRequest(Exception):
+    """
+    Client error, reported as HTTP 400 with the message.
+    """
+
+
+# -------------------------------
+# Request decoding
+# -------------------------------
+def _require(body: Dict, field: str) -> str:
+    value = body.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise BadRequest(f"'{field}' is required")
+    return value
+
+
+def _resume_data(body: Dict) -> Dict:
+    if body.get("resume_pdf"):
+        try:
+            pdf_bytes = base64.b64decode(body["resume_pdf"], validate=True)
+        except (binascii.Error, TypeError, ValueError):
+            raise BadRequest("'resume_pdf' must be base64-encoded PDF bytes")
+        resume_data = cached_parse_resume(io.BytesIO(pdf_bytes))
+        if not resume_data["text"]:
+            raise BadRequest("No extractable text in 'resume_pdf'")
+        return resume_data
+    if body.get("resume_text"):
+        text = _require(body, "resume_text").lower()
+        return {"text": text, "skills": extract_skills(text)}
+    raise BadRequest("'resume_pdf' (base64) or 'resume_text' is required")
+
+
+def _job_data(body: Dict) -> Dict:
+    return parse_job_description(_require(body, "job_description"))
+
+
+def _timeouts(body: Dict) -> Optional[Dict[str, float]]:
+    timeouts = body.get("timeouts")
+    if timeouts is None:
+        return None
+    if not isinstance(timeouts, dict):
+        raise BadRequest("'timeouts' must be an object of stage -> seconds")
+    for stage, seconds in timeouts.items():
+        if stage not in DEFAULT_TIMEOUTS:
+            raise BadRequest(f"Unknown stage in 'timeouts': {stage!r} (expected one of {sorted(DEFAULT_TIMEOUTS)})")
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not 0 < seconds <= MAX_STAGE_TIMEOUT:
+            raise BadRequest(f"'timeouts.{stage}' must be a number of seconds in (0, {MAX_STAGE_TIMEOUT:g}]")
+    return {stage: float(seconds) for stage, seconds in timeouts.items()}
+
+
+# -------------------------------
+# Operations
+# -------------------------------
+def _op_parse(body: Dict, client) -> Dict:
+    result = {}
+    if body.get("resume_pdf") or body.get("resume_text"):
+        result["resume_data"] = _resume_data(body)
+    if body.get("job_description"):
+        result["job_data"] = _job_data(body)
+    if not result:
+        raise BadRequest("Nothing to parse: send a resume and/or 'job_description'")
+    return result
+
+
+def _op_fit(body: Dict, client) -> Dict:
+    resume_data, job_data = _resume_data(body), _job_data(body)
+    resume_dist = analyze_skill_distribution(resume_data["skills"])
+    job_dist = analyze_skill_distribution(job_data["skills"])
+    return {
+        "resume_distribution": resume_dist,
+        "job_distribution": job_dist,
+        "category": job_data["category"],
+        "fit_result": analyze_fit(resume_dist, job_dist, job_data["category"]),
+    }
+
+
+def _op_ats(body: Dict, client) -> Dict:
+    resume_data, job_data = _resume_data(body), _job_data(body)
+    if body.get("mode") == "local" or client is None:
+        return {"ats_result": compute_local_ats_score(resume_data, job_data)}
+    return {"ats_result": compute_ats_score(client, resume_data, job_data)}
+
+
+def _op_analyze(body: Dict, client) -> Dict:
+    if body.get("resume_pdf"):
+        try:
+            resume_file = io.BytesIO(base64.b64decode(body["resume_pdf"], validate=True))
+        except (binascii.Error, TypeError, ValueError):
+            raise BadRequest("'resume_pdf' must be base64-encoded PDF bytes")
+    else:
+        raise BadRequest("'resume_pdf' (base64) is required")
+    return run_analysis(client, resume_file, _require(body, "job_description"), timeouts=_timeouts(body))
+
+
+def _op_cover_letter(body: Dict, client) -> Dict:
+    if client is None:
+        raise BadRequest("An API key is required for cover letters")
+    resume_data = _resume_data(body)
+    letter = generate_cover_letter(
+        client,
+        resume_data["text"],
+        _require(body, "job_description"),
+        tone=body.get("tone") or "Professional",
+        use_cache=body.get("use_cache", True),
+    )
+    return {"cover_letter": letter}
+
+
+def _op_refine(body: Dict, client) -> Dict:
+    if client is None:
+        raise BadRequest("An API key is required for refinement")
+    if "section_text" not in body:
+        return refine_resume(client, _resume_data(body)["text"], _require(body, "job_description"))
+    return refine_resume_section(
+        client, _require(body, "section_text"), _require(body, "job_description")
+    )
+
+
+ROUTES: Dict[str, Callable[[Dict, Optional[object]], Dict]] = {
+    "/parse": _op_parse,
+    "/fit": _op_fit,
+    "/ats": _op_ats,
+    "/analyze": _op_analyze,
+    "/cover-letter": _op_cover_letter,
+    "/refine": _op_refine,
+}
+
+
+# -------------------------------
+# HTTP layer
+# -------------------------------
+class AnalysisHandler(BaseHTTPRequestHandler):
+    server_version = "ResumeAnalyzer/1.0"
+    # HTTP/1.0: one request per connection, so idle keep-alive clients
+    # never hold on to a worker
+    protocol_version = "HTTP/1.0"
+    timeout = SOCKET_TIMEOUT
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload, content_type: str = "application/json") -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        route = self.path if self.path in ROUTES or self.path in ("/healthz", "/metrics") else "other"
+        inc("service_requests_total", route=route, status=status)
+
+    def _client(self):
+        api_key = self.headers.get("X-API-Key") or self.server.api_key
+        if not api_key and is_offline():
+            api_key = "offline"
+        return get_client(api_key) if api_key else None
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok", **self.server.load()})
+        elif self.path == "/metrics":
+            self._send(200, instrumentation.render_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        op = ROUTES.get(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"})
+            return
+        raw = self.rfile.read(length)
+        if op is None:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            body = json.loads(raw or b"{}")
+            if not isinstance(body, dict):
+                raise BadRequest("Body must be a JSON object")
+            with span("service" + self.path.replace("/", "_").replace("-", "_")):
+                result = op(body, self._client())
+        except (BadRequest, json.JSONDecodeError) as e:
+            self._send(400, {"error": str(e)})
+        except StageTimeout as e:
+            self._send(504, {"error": str(e), "stage": e.stage})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+        else:
+            self._send(200, result)
+
+
+class AnalysisServer(HTTPServer):
+    """
+    HTTPServer whose connections are handled by a fixed thread pool.
+    Connections beyond ``workers + queue_size`` are answered with 503
+    right away on the accept thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        workers: int = 8,
+        queue_size: int = 32,
+        api_key: Optional[str] = None,
+        verbose: bool = False,
+    ):
+        super().__init__(address, AnalysisHandler)
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.api_key = api_key
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        # 503s are written off the accept thread, which must never block
+        self._rejecter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="service-reject")
+        self._reject_slots = threading.BoundedSemaphore(MAX_PENDING_REJECTS)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {"in_flight": in_flight, "workers": self.workers, "capacity": self.capacity}
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            inc("service_rejected_total")
+            if self._reject_slots.acquire(blocking=False):
+                self._rejecter.submit(self._reject, request)
+            else:
+                self.shutdown_request(request)
+            return
+        with self._lock:
+            self._in_flight += 1
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _reject(self, request):
+        body = b'{"error": "Server busy, retry later"}'
+        try:
+            request.settimeout(1.0)
+            request.sendall(
+                b"HTTP/1.0 503 Service Unavailable\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Retry-After: 1\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+            # Drain the unread request so closing does not reset the
+            # connection before the client has read the 503
+            request.shutdown(socket.SHUT_WR)
+            drained = 0
+            while drained < MAX_BODY_BYTES:
+                chunk = request.recv(65536)
+                if not chunk:
+                    break
+                drained += len(chunk)
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+            self._reject_slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+        self._rejecter.shutdown(wait=False)
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the resume analysis operations over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=8, help="Requests processed concurrently")
+    parser.add_argument("--queue-size", type=int, default=32, help="Accepted requests waiting for a worker")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer(
+        (args.host, args.port),
+        workers=args.workers,
+        queue_size=args.queue_size,
+        api_key=os.environ.get("GROK_API_KEY") or None,
+        verbose=args.verbose,
+    )
+    print(f"[Service] listening on http://{args.host}:{args.port} "
+          f"({args.workers} workers, queue {args.queue_size})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
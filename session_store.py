@@ -0,0 +1,369 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import inc, set_gauge
+
+
+# Per-session soft budget; above it chat/interview history and the stage
+# memo are trimmed
+SESSION_BUDGET_BYTES = int(os.environ.get("SESSION_BUDGET_BYTES", str(2 * 1024 * 1024)))
+
+# Sessions untouched this long lose their heavy fields (texts, results,
+# histories); the user is asked to run Analyze again
+SESSION_IDLE_SECONDS = float(os.environ.get("SESSION_IDLE_SECONDS", "1800"))
+
+# Idle sweeps run at most this often
+SWEEP_INTERVAL = 30.0
+
+# Messages always kept verbatim when a history is trimmed
+KEEP_MESSAGES = 6
+
+
+SkillTuple = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+# -------------------------------
+# Shared, content-addressed text store
+# -------------------------------
+class TextStore:
+    """
+    Process-wide store of large texts keyed by content hash and
+    reference-counted, so a resume or JD analyzed by several sessions is
+    held once.
+    """
+
+    def __init__(self):
+        self._texts: Dict[str, List] = {}      # key -> [text, refs]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def put(self, text: str) -> str:
+        key = self.key_for(text)
+        with self._lock:
+            entry = self._texts.get(key)
+            if entry is None:
+                self._texts[key] = [text, 1]
+            else:
+                entry[1] += 1
+        return key
+
+    def get(self, key: str) -> str:
+        with self._lock:
+            return self._texts[key][0]
+
+    def share(self, key: str) -> int:
+        """
+        Bytes of the text divided by the number of holders.
+        """
+        with self._lock:
+            text, refs = self._texts[key]
+        return len(text) // refs
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            entry = self._texts.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._texts[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "texts": len(self._texts),
+                "bytes": sum(len(text) for text, _ in self._texts.values()),
+                "refs": sum(refs for _, refs in self._texts.values()),
+            }
+
+
+TEXTS = TextStore()
+
+_skill_tuples: Dict[SkillTuple, SkillTuple] = {}
+_skill_lock = threading.Lock()
+
+
+def intern_skills(skills: Dict[str, List[str]]) -> SkillTuple:
+    """
+    Immutable, interned form of a domain -> skills dict; identical skill
+    sets share one tuple across sessions.
+    """
+    frozen = tuple(
+        (sys.intern(domain), tuple(sys.intern(s) for s in skill_list))
+        for domain, skill_list in skills.items()
+    )
+    with _skill_lock:
+        return _skill_tuples.setdefault(frozen, frozen)
+
+
+# -------------------------------
+# Compact result objects
+# -------------------------------
+class _CompactResult(Mapping):
+    """
+    Read-only mapping over a shared text plus interned skills; supports
+    the ``data["text"]`` / ``data.get(...)`` access of the plain dicts
+    it replaces.
+    """
+
+    __slots__ = ("_text_key", "_skills", "__weakref__")
+    _text_field = "text"
+
+    def __init__(self, text: str, skills: Dict[str, List[str]]):
+        self._text_key = TEXTS.put(text)
+        self._skills = intern_skills(skills)
+
+    def __del__(self):
+        TEXTS.release(self._text_key)
+
+    def _fields(self) -> tuple:
+        return (self._text_field, "skills")
+
+    def __getitem__(self, field: str):
+        if field == self._text_field:
+            return TEXTS.get(self._text_key)
+        if field == "skills":
+            return {domain: list(skill_list) for domain, skill_list in self._skills}
+        raise KeyError(field)
+
+    def __iter__(self):
+        return iter(self._fields())
+
+    def __len__(self) -> int:
+        return len(self._fields())
+
+    def approx_bytes(self) -> int:
+        # Skill tuples are shared and tiny; count this holder's text share
+        return TEXTS.share(self._text_key) + 64
+
+
+class CompactResume(_CompactResult):
+    """
+    Compact ``parse_resume`` result: {"text", "skills"}.
+    """
+
+    __slots__ = ()
+
+
+class CompactJob(_CompactResult):
+    """
+    Compact ``parse_job_description`` result: {"raw_text", "skills", "category"}.
+    """
+
+    __slots__ = ("category",)
+    _text_field = "raw_text"
+
+    def __init__(self, raw_text: str, skills: Dict[str, List[str]], category: str):
+        super().__init__(raw_text, skills)
+        self.category = sys.intern(category)
+
+    def _fields(self) -> tuple:
+        return ("raw_text", "skills", "category")
+
+    def __getitem__(self, field: str):
+        if field == "category":
+            return self.category
+        return super().__getitem__(field)
+
+
+def compact_resume(resume_data: Mapping) -> CompactResume:
+    if isinstance(resume_data, CompactResume):
+        return resume_data
+    return CompactResume(resume_data["text"], resume_data["skills"])
+
+
+def compact_job(job_data: Mapping) -> CompactJob:
+    if isinstance(job_data, CompactJob):
+        return job_data
+    return CompactJob(job_data["raw_text"], job_data["skills"], job_data["category"])
+
+
+# -------------------------------
+# Per-session record
+# -------------------------------
+def _approx_bytes(obj) -> int:
+    if isinstance(obj, _CompactResult):
+        return obj.approx_bytes()
+    if isinstance(obj, str):
+        return len(obj) + 49
+    if isinstance(obj, Mapping):
+        return 64 + sum(_approx_bytes(k) + _approx_bytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return 56 + sum(_approx_bytes(v) for v in obj)
+    return 32
+
+
+class SessionRecord:
+    """
+    Everything heavy one browser session keeps between reruns. Lives in
+    ``st.session_state`` and is tracked (weakly) by SessionRegistry.
+    """
+
+    __slots__ = (
+        "session_id", "last_active", "evicted",
+        "resume_data", "job_data", "ats_result", "fit_result", "analysis_inputs",
+        "graph", "chat_history", "interview_history", "bots",
+        "__weakref__",
+    )
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.last_active = time.monotonic()
+        self.evicted = False
+        self.graph = None
+        self.bots: Dict[str, object] = {}
+        self.clear()
+
+    @property
+    def analyzed(self) -> bool:
+        return self.resume_data is not None
+
+    def clear(self) -> None:
+        """
+        Drop analysis results and histories (keeps the session itself).
+        """
+        self.resume_data: Optional[CompactResume] = None
+        self.job_data: Optional[CompactJob] = None
+        self.ats_result: Optional[Dict] = None
+        self.fit_result: Optional[Dict] = None
+        self.analysis_inputs: Optional[Dict] = None
+        self.chat_history: List[Dict] = []
+        self.interview_history: List[Dict] = []
+        if self.graph is not None:
+            self.graph.clear()
+        for bot in self.bots.values():
+            bot.reset()
+
+    def store_analysis(self, result: Dict) -> None:
+        self.resume_data = compact_resume(result["resume_data"])
+        self.job_data = compact_job(result["job_data"])
+        self.ats_result = result["ats_result"]
+        self.fit_result = result["fit_result"]
+        self.analysis_inputs = result["input_keys"]
+        self.evicted = False
+
+    def approx_bytes(self) -> int:
+        total = sum(_approx_bytes(v) for v in (
+            self.resume_data, self.job_data, self.ats_result, self.fit_result,
+            self.chat_history, self.interview_history,
+        ))
+        if self.graph is not None:
+            total += sum(_approx_bytes(v) for v in self.graph.values())
+        # Chatbots hold a summary, recent turns and shares of the context texts
+        total += sum(bot.approx_bytes() for bot in self.bots.values() if hasattr(bot, "approx_bytes"))
+        return total
+
+    def enforce_budget(self, budget: int = SESSION_BUDGET_BYTES) -> int:
+        """
+        Trim the session below ``budget`` bytes, cheapest losses first:
+        stage memo, then old interview feedback, then old chat messages
+        (the chatbot keeps its own rolling summary of those). Returns the
+        resulting size.
+        """
+        size = self.approx_bytes()
+        if size <= budget:
+            return size
+        inc("session_trims_total")
+
+        if self.graph is not None:
+            self.graph.clear()
+            size = self.approx_bytes()
+
+        if size > budget:
+            for msg in self.interview_history[:-KEEP_MESSAGES]:
+                msg.pop("feedback", None)
+            size = self.approx_bytes()
+
+        while size > budget and len(self.chat_history) > KEEP_MESSAGES:
+            size -= _approx_bytes(self.chat_history.pop(0))
+        return size
+
+
+# -------------------------------
+# Registry + idle eviction
+# -------------------------------
+class SessionRegistry:
+    """
+    Weak registry of live SessionRecords: records disappear when their
+    Streamlit session is dropped; idle ones are cleared by ``sweep``.
+    """
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS, budget: int = SESSION_BUDGET_BYTES):
+        self.idle_seconds = idle_seconds
+        self.budget = budget
+        self._records: "weakref.WeakValueDictionary[str, SessionRecord]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def touch(self, record: SessionRecord) -> None:
+        with self._lock:
+            self._records[record.session_id] = record
+        record.last_active = time.monotonic()
+        record.enforce_budget(self.budget)
+        if record.last_active - self._last_sweep >= SWEEP_INTERVAL:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """
+        Clear heavy fields of sessions idle for ``idle_seconds``; returns
+        how many were evicted. Also refreshes the session gauges.
+        """
+        now = time.monotonic()
+        self._last_sweep = now
+        with self._lock:
+            records = list(self._records.values())
+
+        evicted = 0
+        for record in records:
+            if not record.evicted and now - record.last_active >= self.idle_seconds:
+                record.clear()
+                record.evicted = True
+                evicted += 1
+        if evicted:
+            inc("sessions_evicted_total", evicted)
+
+        stats = self.stats(records)
+        set_gauge("sessions_active", stats["sessions"])
+        set_gauge("session_bytes_total", stats["bytes_total"])
+        set_gauge("session_bytes_max", stats["bytes_max"])
+        set_gauge("session_bytes_mean", stats["bytes_per_session"])
+        set_gauge("shared_text_bytes", TEXTS.stats()["bytes"])
+        return evicted
+
+    def stats(self, records: Optional[List[SessionRecord]] = None) -> Dict[str, int]:
+        if records is None:
+            with self._lock:
+                records = list(self._records.values())
+        sizes = [r.approx_bytes() for r in records]
+        return {
+            "sessions": len(sizes),
+            "bytes_total": sum(sizes),
+            "bytes_max": max(sizes, default=0),
+            "bytes_per_session": sum(sizes) // len(sizes) if sizes else 0,
+        }
+
+
+REGISTRY = SessionRegistry()
+
+
+def current_session(state) -> SessionRecord:
+    """
+    The SessionRecord held in a Streamlit ``session_state`` (created on
+    first use), marked active and kept within its budget.
+    """
+    record = state.get("session") if hasattr(state, "get") else None
+    if record is None:
+        record = SessionRecord(uuid.uuid4().hex)
+        state["session"] = record
+    REGISTRY.touch(record)
+    return record
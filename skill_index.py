@@ -0,0 +1,271 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from skill_matcher import DEFAULT_MATCHER, SKILL_TAXONOMY
+
+
+SkillInput = Union[Dict[str, List[str]], Iterable[str]]
+
+_ONE = np.uint64(1)
+
+
+def _flatten(skills: SkillInput) -> Tuple[str, ...]:
+    if isinstance(skills, dict):
+        skills = (s for skill_list in skills.values() for s in skill_list)
+    return tuple(sorted({s.lower() for s in skills}))
+
+
+def _popcount(bits: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):             # NumPy >= 2.0
+        return int(np.bitwise_count(bits).sum())
+    return int(np.unpackbits(bits.view(np.uint8)).sum())
+
+
+# -------------------------------
+# Query parsing
+# -------------------------------
+_TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()]+')
+
+
+@lru_cache(maxsize=1024)
+def parse_query(query: str) -> tuple:
+    """
+    Parse a boolean skill query into a small AST.
+
+    Grammar (operators are case-insensitive, adjacency means AND):
+        expr   := term (OR term)*
+        term   := factor ([AND] factor)*
+        factor := NOT factor | "(" expr ")" | skill | "quoted skill" | domain:Name
+    """
+    tokens = _TOKEN.findall(query)
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> str:
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError(f"Unexpected end of query: {query!r}")
+        pos += 1
+        return tokens[pos - 1]
+
+    def expr():
+        node = term()
+        while (peek() or "").upper() == "OR":
+            take()
+            node = ("or", node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() is not None and peek() != ")" and peek().upper() != "OR":
+            if peek().upper() == "AND":
+                take()
+            node = ("and", node, factor())
+        return node
+
+    def factor():
+        tok = take()
+        if tok.upper() == "NOT":
+            return ("not", factor())
+        if tok == "(":
+            node = expr()
+            if take() != ")":
+                raise ValueError(f"Missing ')' in query: {query!r}")
+            return node
+        if tok == ")" or tok.upper() in ("AND", "OR"):
+            raise ValueError(f"Unexpected {tok!r} in query: {query!r}")
+        if tok.lower().startswith("domain:"):
+            return ("domain", tok.split(":", 1)[1].lower())
+        return ("skill", tok.strip('"').lower())
+
+    if not tokens:
+        raise ValueError("Empty query")
+    node = expr()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected {tokens[pos]!r} in query: {query!r}")
+    return node
+
+
+# -------------------------------
+# Inverted skill index
+# -------------------------------
+class SkillIndex:
+    """
+    Inverted index skill -> candidates, stored as dense uint64 bitsets
+    (one bit per candidate id). Boolean queries are word-wise numpy ops,
+    i.e. ~16k words per posting list at 1M candidates.
+
+    Candidates are identified by an external key (e.g. the resume path)
+    and can be added, replaced and removed incrementally. A per-domain
+    bitset ("has at least one skill in the domain") backs ``domain:``
+    filters, using the SKILL_KEYWORDS domains.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._words = max(1, (capacity + 63) // 64)
+        self._postings: Dict[str, np.ndarray] = {}
+        self._domains: Dict[str, np.ndarray] = {
+            d.lower(): self._empty() for d in SKILL_TAXONOMY
+        }
+        self._alive = self._empty()
+
+        self._ids: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._skills: List[Tuple[str, ...]] = []
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ---------- storage helpers ----------
+    def _empty(self) -> np.ndarray:
+        return np.zeros(self._words, dtype=np.uint64)
+
+    def _grow(self, needed_bits: int) -> None:
+        if needed_bits <= self._words * 64:
+            return
+        words = self._words
+        while words * 64 < needed_bits:
+            words *= 2
+        pad = words - self._words
+
+        def grow(bits):
+            return np.concatenate([bits, np.zeros(pad, dtype=np.uint64)])
+
+        self._postings = {k: grow(v) for k, v in self._postings.items()}
+        self._domains = {k: grow(v) for k, v in self._domains.items()}
+        self._alive = grow(self._alive)
+        self._words = words
+
+    def _posting(self, skill: str) -> np.ndarray:
+        bits = self._postings.get(skill)
+        if bits is None:
+            bits = self._postings[skill] = self._empty()
+        return bits
+
+    def _domains_of(self, skills: Tuple[str, ...]) -> set:
+        return {d.lower() for s in skills for d in DEFAULT_MATCHER.skill_domains.get(s, ())}
+
+    def _allocate(self, key: str) -> int:
+        if key in self._ids:
+            self.remove(key)
+        if self._free:
+            cid = self._free.pop()
+            self._keys[cid] = key
+        else:
+            cid = len(self._keys)
+            self._keys.append(key)
+            self._skills.append(())
+        self._ids[key] = cid
+        return cid
+
+    # ---------- updates ----------
+    def add(self, key: str, skills: SkillInput) -> int:
+        """
+        Add (or replace) one candidate; returns its internal id.
+        """
+        return self.add_many([(key, skills)])[0]
+
+    def add_many(self, items: Iterable[Tuple[str, SkillInput]]) -> List[int]:
+        """
+        Bulk add: bits are set per skill with one vectorized scatter.
+        """
+        by_skill: Dict[str, List[int]] = {}
+        by_domain: Dict[str, List[int]] = {}
+        ids = []
+
+        # Last occurrence wins if a key repeats within one batch
+        for key, skills in dict(items).items():
+            flat = _flatten(skills)
+            cid = self._allocate(key)
+            self._skills[cid] = flat
+            ids.append(cid)
+            for s in flat:
+                by_skill.setdefault(s, []).append(cid)
+            for d in self._domains_of(flat):
+                by_domain.setdefault(d, []).append(cid)
+
+        if not ids:
+            return ids
+        self._grow(max(ids) + 1)
+
+        def scatter(bits: np.ndarray, cids: List[int]) -> None:
+            arr = np.asarray(cids, dtype=np.uint64)
+            np.bitwise_or.at(bits, (arr >> np.uint64(6)).astype(np.intp), _ONE << (arr & np.uint64(63)))
+
+        scatter(self._alive, ids)
+        for skill, cids in by_skill.items():
+            scatter(self._posting(skill), cids)
+        for domain, cids in by_domain.items():
+            scatter(self._domains.setdefault(domain, self._empty()), cids)
+        return ids
+
+    def remove(self, key: str) -> bool:
+        cid = self._ids.pop(key, None)
+        if cid is None:
+            return False
+
+        word, mask = cid >> 6, ~(_ONE << np.uint64(cid & 63))
+        self._alive[word] &= mask
+        for skill in self._skills[cid]:
+            self._postings[skill][word] &= mask
+        for domain in self._domains_of(self._skills[cid]):
+            self._domains[domain][word] &= mask
+
+        self._keys[cid] = None
+        self._skills[cid] = ()
+        self._free.append(cid)
+        return True
+
+    # ---------- queries ----------
+    def _eval(self, node: tuple) -> np.ndarray:
+        op = node[0]
+        if op == "skill":
+            bits = self._postings.get(node[1])
+            return bits if bits is not None else self._empty()
+        if op == "domain":
+            bits = self._domains.get(node[1])
+            return bits if bits is not None else self._empty()
+        if op == "not":
+            return self._alive & ~self._eval(node[1])
+        if op == "and":
+            return self._eval(node[1]) & self._eval(node[2])
+        return self._eval(node[1]) | self._eval(node[2])
+
+    def match_bits(self, query: str) -> np.ndarray:
+        return self._eval(parse_query(query)) & self._alive
+
+    def count(self, query: str) -> int:
+        return _popcount(self.match_bits(query))
+
+    def query_ids(self, query: str) -> np.ndarray:
+        bits = self.match_bits(query)
+        return np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder="little"))
+
+    def query(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Keys of candidates matching e.g. ``python AND (aws OR gcp) AND NOT php``
+        or ``domain:Cloud AND "machine learning"``.
+        """
+        ids = self.query_ids(query)
+        if limit is not None:
+            ids = ids[:limit]
+        return [self._keys[i] for i in ids]
+
+    def skills_of(self, key: str) -> Tuple[str, ...]:
+        return self._skills[self._ids[key]]
+
+    # ---------- builders ----------
+    @classmethod
+    def from_store(cls, store) -> "SkillIndex":
+        """
+        Build from a resume_store.ResumeStore (keys are source paths).
+        """
+        index = cls(capacity=store.count()["resumes"])
+        index.add_many((path, skills) for _, path, skills, _ in store.iter_skills())
+        return index
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+
+# -------------------------------
+# Shared skill taxonomy (resume + JD)
+# -------------------------------
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "Frontend": [
+        "html", "css", "javascript", "react", "angular", "vue",
+        "bootstrap", "typescript", "responsive design", "ui/ux", "figma",
+        "ui", "ux"
+    ],
+    "Backend": [
+        "python", "java", "nodejs", "node", "express", "django", "flask",
+        "spring", "php", "c#", ".net", "api", "rest", "graphql",
+        "microservices"
+    ],
+    "Data": [
+        "sql", "nosql", "mysql", "postgresql", "mongodb", "pandas", "numpy",
+        "machine learning", "data analysis", "data engineering", "spark",
+        "airflow", "etl", "data warehouse", "big data", "power bi", "tableau"
+    ],
+    "Cloud": [
+        "aws", "azure", "gcp", "docker", "kubernetes",
+        "terraform", "ci/cd", "jenkins", "lambda", "s3"
+    ],
+    "Security": [
+        "cybersecurity", "security", "penetration testing",
+        "vulnerability assessment", "siem", "soc", "ids", "ips", "nmap",
+        "burp", "owasp", "incident response", "threat detection", "malware",
+        "firewall", "encryption"
+    ],
+    "General": [
+        "git", "linux", "agile", "scrum", "problem solving",
+        "communication", "teamwork"
+    ],
+}
+
+
+def taxonomy_version(taxonomy: Dict[str, List[str]]) -> str:
+    """
+    Short stable fingerprint of a taxonomy (used in cache keys).
+    """
+    payload = json.dumps(taxonomy, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+TAXONOMY_VERSION = taxonomy_version(SKILL_TAXONOMY)
+
+# Compiled matcher artifacts (regex source + nested-keyword table) are
+# cached here per taxonomy version, so startup skips the trie build
+ARTIFACT_DIR = os.environ.get(
+    "SKILL_ARTIFACT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ai-resume-analyzer"),
+)
+
+# Bump when the compiled form below changes
+MATCHER_FORMAT = "1"
+
+
+# -------------------------------
+# Helper: canonical keyword form
+# -------------------------------
+def _canonical(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def _atom(ch: str) -> str:
+    # Multi-word skills may be split by newlines / repeated spaces in PDF text
+    return r"\s+" if ch == " " else re.escape(ch)
+
+
+def _trie_regex(keywords: List[str]) -> str:
+    """
+    Build a prefix-factored alternation so each text position only
+    branches on the next character instead of trying every keyword.
+    Longer continuations are tried before the end of a shorter keyword.
+    """
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def walk(node: dict) -> str:
+        branches = [
+            _atom(ch) + walk(child)
+            for ch, child in sorted(node.items())
+            if ch != ""
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ("|" if "" in node else "") + ")"
+
+    return walk(trie)
+
+
+# -------------------------------
+# Compiled matcher
+# -------------------------------
+class SkillMatcher:
+    """
+    Single-pass skill matcher over a domain -> keywords taxonomy.
+
+    All keywords are compiled into one prefix-factored regex, so a
+    document is scanned once regardless of taxonomy size. A keyword
+    matches when it is not glued to other word characters on either side.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]], compiled: Optional[Dict] = None):
+        self.taxonomy = taxonomy
+        self.version = taxonomy_version(taxonomy)
+
+        self.skill_domains: Dict[str, Tuple[str, ...]] = {}
+        for domain, keywords in taxonomy.items():
+            for kw in keywords:
+                kw = _canonical(kw)
+                if domain not in self.skill_domains.get(kw, ()):
+                    self.skill_domains[kw] = self.skill_domains.get(kw, ()) + (domain,)
+
+        if compiled is None:
+            compiled = self._compile(list(self.skill_domains))
+        self._source: str = compiled["pattern"]
+        self._nested: Dict[str, List[str]] = compiled["nested"]
+        self._pattern = re.compile(self._source, re.IGNORECASE)
+
+        self._single: Dict[str, re.Pattern] = {
+            other: re.compile(_trie_regex([other]), re.IGNORECASE)
+            for nested in self._nested.values()
+            for other in nested
+        }
+
+    @staticmethod
+    def _compile(keywords: List[str]) -> Dict:
+        # Zero-width scan: every start position is tried, so keywords that
+        # overlap at different offsets ("big data" / "data analysis") are all seen.
+        pattern = r"(?<!\w)(?=(" + _trie_regex(keywords) + r")(?!\w))"
+
+        # Shorter keywords that are whole-word prefixes of a longer one
+        # ("spring" inside "spring boot") are shadowed by the longest match
+        # at the same position, so they are recovered explicitly.
+        nested: Dict[str, List[str]] = {}
+        for kw in keywords:
+            for other in keywords:
+                if (
+                    other != kw
+                    and kw.startswith(other)
+                    and not (kw[len(other)].isalnum() or kw[len(other)] == "_")
+                ):
+                    nested.setdefault(kw, []).append(other)
+        return {"pattern": pattern, "nested": nested}
+
+    @classmethod
+    def cached(cls, taxonomy: Dict[str, List[str]], directory: Optional[str] = None) -> "SkillMatcher":
+        """
+        Build from the compiled artifact for this taxonomy version when one
+        exists, otherwise compile and write it (best effort: a read-only
+        cache dir just means compiling every time).
+        """
+        version = taxonomy_version(taxonomy)
+        path = os.path.join(directory or ARTIFACT_DIR, f"skill_matcher-{version}-v{MATCHER_FORMAT}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(taxonomy, compiled=json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+
+        matcher = cls(taxonomy)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"pattern": matcher._source, "nested": matcher._nested}, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return matcher
+
+    def find_all(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Return every matched skill with its (start, end) character offsets
+        in ``text`` as evidence.
+        """
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        if not text:
+            return hits
+
+        for m in self._pattern.finditer(text):
+            start, end = m.span(1)
+            kw = _canonical(m.group(1))
+            hits.setdefault(kw, []).append((start, end))
+
+            for other in self._nested.get(kw, ()):
+                inner = self._single[other].match(text, start)
+                if inner:
+                    hits.setdefault(other, []).append(inner.span())
+
+        for spans in hits.values():
+            spans.sort()
+        return hits
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Occurrences per matched skill.
+        """
+        return {kw: len(spans) for kw, spans in self.find_all(text).items()}
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """
+        Matched skills grouped by domain (taxonomy order, sorted skills).
+        Returns ONLY domains with matched skills.
+        """
+        return self.group_by_domain(self.find_all(text))
+
+    def group_by_domain(self, skills) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for kw in skills:
+            for domain in self.skill_domains.get(kw, ()):
+                grouped.setdefault(domain, []).append(kw)
+
+        return {
+            domain: sorted(grouped[domain])
+            for domain in self.taxonomy
+            if domain in grouped
+        }
+
+
+# Built once at import (from the cached artifact) and shared by
+# resume_parser / job_parser
+DEFAULT_MATCHER = SkillMatcher.cached(SKILL_TAXONOMY)
+
+
+def match_skills(text: str) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Skill -> evidence offsets using the shared taxonomy.
+    """
+    return DEFAULT_MATCHER.find_all(text)
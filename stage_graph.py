@@ -0,0 +1,152 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# stage name -> (names of the inputs it depends on, version string)
+StageSpec = Dict[str, Tuple[Iterable[str], str]]
+
+
+def input_key(*parts) -> str:
+    """
+    Hash of one graph input (bytes or str parts).
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class StageGraph:
+    """
+    Memoized stage graph. Each stage's key is derived from the keys of
+    the inputs it depends on plus the stage version, so a stage is only
+    recomputed when one of *its* inputs changed (e.g. editing the job
+    description leaves the parsed resume untouched).
+
+    Holds the last ``max_entries`` stage outputs (LRU); meant to live in
+    one user session, with the shared resume / LLM caches behind it.
+    ``compactors`` maps a stage to a function that turns its output into
+    the (smaller) form kept in the memo.
+    """
+
+    def __init__(
+        self,
+        stages: StageSpec,
+        max_entries: int = 32,
+        compactors: Optional[Dict[str, Callable]] = None,
+    ):
+        self.stages = {name: (tuple(deps), version) for name, (deps, version) in stages.items()}
+        self.max_entries = max_entries
+        self.compactors = compactors or {}
+        self._memo: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.last_run: Dict[str, str] = {}
+
+    def key(self, stage: str, inputs: Dict[str, str]) -> str:
+        deps, version = self.stages[stage]
+        return input_key(stage, version, *(f"{d}={inputs[d]}" for d in deps))
+
+    def begin_run(self) -> None:
+        with self._lock:
+            self.last_run = {}
+
+    # ---------- memo ----------
+    def _lookup(self, key: str):
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return True, self._memo[key]
+        return False, None
+
+    def _store(self, stage: str, key: str, value) -> None:
+        compact = self.compactors.get(stage)
+        if compact is not None:
+            value = compact(value)
+        with self._lock:
+            self._memo[key] = value
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def _mark(self, stage: str, status: str) -> None:
+        with self._lock:
+            self.last_run[stage] = status
+
+    # ---------- evaluation ----------
+    def run(
+        self,
+        stage: str,
+        inputs: Dict[str, str],
+        fn: Callable,
+        *args,
+        cacheable: Optional[Callable[[object], bool]] = None,
+    ):
+        """
+        Return the memoized output of ``stage`` for these inputs, or
+        compute it as ``fn(*args)``. ``cacheable(result)`` can veto
+        memoizing a result (e.g. a fallback after an error).
+        """
+        key = self.key(stage, inputs)
+        hit, value = self._lookup(key)
+        if hit:
+            self._mark(stage, "reused")
+            return value
+        self._mark(stage, "computed")
+        value = fn(*args)
+        if cacheable is None or cacheable(value):
+            self._store(stage, key, value)
+        return value
+
+    def submit(
+        self,
+        executor: Executor,
+        stage: str,
+        inputs: Dict[str, str],
+        fn: Callable,
+        *args,
+        cacheable: Optional[Callable[[object], bool]] = None,
+    ) -> Future:
+        """
+        Like ``run`` but asynchronous: a memo hit returns an already
+        completed future, a miss runs on ``executor`` and is memoized
+        when it succeeds.
+        """
+        key = self.key(stage, inputs)
+        hit, value = self._lookup(key)
+        if hit:
+            self._mark(stage, "reused")
+            future: Future = Future()
+            future.set_result(value)
+            return future
+
+        self._mark(stage, "computed")
+        future = executor.submit(fn, *args)
+
+        def remember(done: Future) -> None:
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            if cacheable is None or cacheable(result):
+                self._store(stage, key, result)
+
+        future.add_done_callback(remember)
+        return future
+
+    def values(self) -> list:
+        with self._lock:
+            return list(self._memo.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._memo), **{
+                status: sum(1 for s in self.last_run.values() if s == status)
+                for status in ("reused", "computed")
+            }}
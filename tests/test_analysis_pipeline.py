@@ -0,0 +1,66 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+import analysis_pipeline
+from analysis_pipeline import StageTimeout, _stream_ats, _wait_with_updates, run_analysis
+from benchmarks.synthetic import make_pdf
+from resume_parser import parse_resume
+
+
+def test_updates_queued_before_completion_are_delivered():
+    future: Future = Future()
+    updates: "queue.Queue" = queue.Queue()
+    for partial in ({"overall_score": 70}, {"overall_score": 70, "summary": "Good fit"}):
+        updates.put(partial)
+    future.set_result({"overall_score": 70, "summary": "Good fit"})
+
+    seen = []
+    result = _wait_with_updates(future, updates, threading.Event(), seen.append, "ats", {"ats": 1.0})
+
+    assert result["summary"] == "Good fit"
+    assert seen == [{"overall_score": 70}, {"overall_score": 70, "summary": "Good fit"}]
+
+
+def test_worker_stops_queueing_after_timeout(monkeypatch):
+    release = threading.Event()
+
+    def fake_stream(client, resume_data, job_data):
+        yield {"overall_score": 70}
+        release.wait(1)
+        yield {"overall_score": 70, "summary": "late"}
+
+    monkeypatch.setattr(analysis_pipeline, "compute_ats_score_stream", fake_stream)
+    updates: "queue.Queue" = queue.Queue()
+    abandoned = threading.Event()
+    worker = analysis_pipeline._llm_executor.submit(_stream_ats, None, {}, {}, updates, abandoned)
+
+    with pytest.raises(StageTimeout):
+        _wait_with_updates(worker, updates, abandoned, lambda partial: None, "ats", {"ats": 0.2})
+    release.set()
+
+    assert worker.result(timeout=1)["summary"] == "late"
+    assert updates.empty()
+
+
+def test_slow_ats_calls_do_not_starve_parsing(monkeypatch):
+    release = threading.Event()
+
+    def stuck_ats(client, resume_data, job_data):
+        release.wait(10)
+        return {"overall_score": 0}
+
+    monkeypatch.setattr(analysis_pipeline, "compute_ats_score", stuck_ats)
+    monkeypatch.setattr(analysis_pipeline, "cached_parse_resume", parse_resume)
+    pdf = make_pdf(["Python developer\nAWS Docker"])
+    try:
+        # Fill every LLM worker with ATS calls that outlive their timeout
+        timeouts = {"ats": 0.05, "parse_resume": 1.0, "parse_job": 1.0}
+        for i in range(analysis_pipeline._llm_executor._max_workers + 2):
+            result = run_analysis(object(), pdf, f"Backend engineer {i}: Python", timeouts=timeouts)
+            assert "did not respond" in result["ats_result"]["summary"]
+            assert result["resume_data"]["skills"]
+    finally:
+        release.set()
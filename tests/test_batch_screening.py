@@ -0,0 +1,25 @@
+import pytest
+
+from batch_screening import screen_resumes
+from benchmarks.synthetic import make_pdf
+
+JOB = "Backend engineer: Python, Django, PostgreSQL, AWS, Docker"
+
+
+def test_top_k_must_be_positive():
+    with pytest.raises(ValueError):
+        screen_resumes(JOB, [], top_k=0)
+
+
+def test_open_files_work_with_worker_processes(tmp_path):
+    for i in range(3):
+        (tmp_path / f"r{i}.pdf").write_bytes(make_pdf([f"Python Django developer {i}\nAWS Docker PostgreSQL"]))
+    files = [open(path, "rb") for path in sorted(tmp_path.iterdir())]
+    try:
+        result = screen_resumes(JOB, [(f.name, f) for f in files], top_k=2, workers=2)
+    finally:
+        for f in files:
+            f.close()
+
+    assert result["processed"] == 3 and result["failed"] == 0
+    assert len(result["shortlist"]) == 2
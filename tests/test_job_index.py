@@ -0,0 +1,32 @@
+import numpy as np
+
+from job_index import JobIndex
+
+
+def test_duplicate_id_in_one_batch_keeps_last_posting():
+    index = JobIndex()
+    added = index.add_many([
+        ("a", "Backend engineer: Python, Django, PostgreSQL"),
+        ("a", "Frontend engineer: React, TypeScript, CSS"),
+    ])
+
+    assert added == 1
+    assert len(index) == 1
+    top = index.query({"text": "react typescript", "skills": {"frontend": ["react"]}}, k=1)
+    assert top[0]["job_id"] == "a" and "react" in top[0]["matched_skills"]
+
+
+def test_document_frequencies_track_live_postings():
+    index = JobIndex()
+    index.add_many([("a", "Python Django developer"), ("b", "Java Spring developer")])
+    index.scores({"text": "", "skills": {}})
+    df_before = index._df.copy()
+
+    index.add("a", "Python Django developer")      # replace with identical text
+    index.scores({"text": "", "skills": {}})
+    assert np.array_equal(index._df, df_before)
+
+    index.remove("a")
+    index.remove("b")
+    index.scores({"text": "", "skills": {}})
+    assert not index._df.any()
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from llm_cache import LLMCache, SingleFlight
+
+
+def _slow_stream(chunks, started: threading.Event, delay: float = 0.05):
+    started.set()
+    for chunk in chunks:
+        time.sleep(delay)
+        yield chunk
+
+
+def test_do_followers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"score": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("k", compute))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"score": 1}] * 4
+    assert flights.stats()["collapsed"] == 3
+
+
+def test_plain_call_does_not_join_in_flight_stream(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.sqlite3"))
+    started = threading.Event()
+    streamed = []
+
+    stream = threading.Thread(target=lambda: streamed.extend(
+        cache.shared_stream("key", lambda: _slow_stream(["a", "b", "c"], started))
+    ))
+    stream.start()
+    started.wait(1)
+
+    # Same key while the stream is in flight: must compute its own value
+    assert cache.get_or_compute("key", lambda: {"overall_score": 70}) == {"overall_score": 70}
+
+    stream.join()
+    assert streamed == ["a", "b", "c"]
+
+
+def test_stream_does_not_join_in_flight_plain_call(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.sqlite3"))
+    started = threading.Event()
+    results = []
+
+    def compute():
+        started.set()
+        time.sleep(0.2)
+        return "letter"
+
+    plain = threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+    plain.start()
+    started.wait(1)
+
+    # Same key while the plain call is in flight: must get its own chunks
+    assert list(cache.shared_stream("key", lambda: iter(["x", "y"]))) == ["x", "y"]
+
+    plain.join()
+    assert results == ["letter"]
+
+
+def test_stream_followers_replay_and_follow_leader():
+    flights = SingleFlight()
+    started = threading.Event()
+    opened = []
+
+    def open_stream():
+        opened.append(1)
+        return _slow_stream(["a", "b", "c"], started)
+
+    outputs = []
+    leader = threading.Thread(target=lambda: outputs.append(list(flights.stream("k", open_stream))))
+    leader.start()
+    started.wait(1)
+    follower = list(flights.stream("k", open_stream))
+    leader.join()
+
+    assert len(opened) == 1
+    assert follower == ["a", "b", "c"]
+    assert outputs == [["a", "b", "c"]]
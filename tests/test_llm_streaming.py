@@ -0,0 +1,27 @@
+import instrumentation
+from llm_client import LLMClient
+from llm_streaming import stream_completion
+from llm_transport import SyntheticTransport
+
+
+def _counter(snap, name):
+    return sum(c["value"] for c in snap["counters"] if c["name"] == name)
+
+
+def test_streamed_completion_records_token_usage():
+    instrumentation.set_enabled(True)
+    instrumentation.reset()
+    try:
+        client = LLMClient(SyntheticTransport("instant"), requests_per_minute=1000, tokens_per_minute=10 ** 7)
+        text = "".join(stream_completion(
+            client, stage="chat", model="test-model",
+            messages=[{"role": "user", "content": "How can I improve my resume?"}],
+        ))
+        snap = instrumentation.snapshot()
+    finally:
+        instrumentation.reset()
+        instrumentation.set_enabled(False)
+
+    assert text
+    assert _counter(snap, "llm_prompt_tokens_total") > 0
+    assert _counter(snap, "llm_completion_tokens_total") > 0
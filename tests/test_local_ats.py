@@ -0,0 +1,8 @@
+from local_ats import _contains
+
+
+def test_contains_matches_whole_terms_only():
+    assert _contains("java", "java and spring")
+    assert not _contains("java", "javascript developer")
+    assert _contains("c++", "modern c++ code")
+    assert _contains("node.js", "built apis in node.js.")
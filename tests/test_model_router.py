@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import model_router
+from llm_client import LLMClient
+from model_router import TASK_POLICIES, ModelRouter
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FakeInner:
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs["model"])
+        if kwargs["model"] == "small":
+            raise RateLimited("slow down")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))], usage=None)
+
+
+def test_invalid_routes_fall_back_to_defaults(monkeypatch, capsys):
+    for raw in ("{not json", '["chat"]', '{"chat": 5}'):
+        monkeypatch.setenv("LLM_ROUTES", raw)
+        assert model_router._policies_from_env() == TASK_POLICIES
+        assert "LLM_ROUTES" in capsys.readouterr().out
+
+
+def test_attempt_with_fallback_is_not_retried():
+    inner = FakeInner()
+    client = LLMClient(inner, requests_per_minute=1000, tokens_per_minute=10**7)
+    router = ModelRouter(
+        policies={"chat": {"tier": "fast", "max_latency": 5.0}},
+        tiers={"quality": ["big"], "fast": ["small", "big"]},
+    )
+
+    response = router.create(client, "chat", messages=[{"role": "user", "content": "hi"}])
+
+    assert response.choices[0].message.content == "ok"
+    assert inner.calls == ["small", "big"]
@@ -0,0 +1,27 @@
+from resume_cache import ResumeCache
+
+
+def _entry(text: str) -> dict:
+    return {"text": text, "skills": {"backend": ["python"]}}
+
+
+def test_overwrite_does_not_double_count_disk_size(tmp_path):
+    cache = ResumeCache(directory=str(tmp_path))
+    cache.put("k" * 64, _entry("a"))       # first put scans the directory
+    cache.put("j" * 64, _entry("b"))
+    size = cache._disk_bytes
+
+    for _ in range(5):
+        cache.put("j" * 64, _entry("b"))
+    assert cache._disk_bytes == size == cache._scan_size()
+
+
+def test_cached_entries_cannot_be_mutated_by_callers(tmp_path):
+    cache = ResumeCache(directory=str(tmp_path))
+    value = _entry("python developer")
+    cache.put("k" * 64, value)
+    value["skills"]["backend"].append("java")
+
+    first = cache.get("k" * 64)
+    first["skills"]["backend"].append("go")
+    assert cache.get("k" * 64)["skills"] == {"backend": ["python"]}
@@ -0,0 +1,29 @@
+import io
+
+from benchmarks.synthetic import make_pdf
+from resume_parser import PARALLEL_PAGE_THRESHOLD, extract_text_from_pdf, read_pdf_bytes
+from resume_refiner import split_resume
+
+
+def test_original_case_text_keeps_headings_for_refinement():
+    pdf = make_pdf(["Jane Doe\nEXPERIENCE\n- Built APIs in Python\n- Led a team of 4", "SKILLS\n- Python, AWS"])
+
+    assert extract_text_from_pdf(pdf) == extract_text_from_pdf(pdf).lower()
+    original = extract_text_from_pdf(pdf, lowercase=False)
+    assert "Built APIs in Python" in original
+
+    sections = [chunk["section"] for chunk in split_resume(original)]
+    assert sections == ["EXPERIENCE", "SKILLS"]
+
+
+def test_oversized_upload_is_rejected_after_a_bounded_read():
+    upload = io.BytesIO(b"%PDF-" + b"0" * 1000)
+
+    assert len(read_pdf_bytes(upload, limit=101)) == 101
+    assert extract_text_from_pdf(upload, max_bytes=100) == ""
+
+
+def test_parallel_extraction_matches_serial():
+    pdf = make_pdf([f"Page {i}\nPython AWS Docker" for i in range(PARALLEL_PAGE_THRESHOLD + 8)])
+
+    assert extract_text_from_pdf(pdf, parallel=True) == extract_text_from_pdf(pdf, parallel=False)
@@ -0,0 +1,53 @@
+import json
+import socket
+import threading
+
+import pytest
+
+import llm_client
+from service import MAX_BODY_BYTES, AnalysisServer
+
+
+@pytest.fixture
+def server():
+    srv = AnalysisServer(("127.0.0.1", 0), workers=2, queue_size=2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(server, path: str, headers: str, body: bytes = b"") -> tuple:
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(f"POST {path} HTTP/1.0\r\n{headers}\r\n".encode() + body)
+        response = b""
+        while chunk := sock.recv(65536):
+            response += chunk
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_invalid_or_oversized_content_length(server):
+    assert _post(server, "/fit", "Content-Length: abc\r\n")[0] == 400
+    assert _post(server, "/fit", "Content-Length: -5\r\n")[0] == 400
+    assert _post(server, "/fit", f"Content-Length: {MAX_BODY_BYTES + 1}\r\n")[0] == 413
+
+
+def test_analyze_rejects_invalid_timeouts(server):
+    for timeouts in ({"ats": "soon"}, {"ats": 10**6}, {"nope": 5}, [1]):
+        body = json.dumps({"resume_pdf": "JVBERg==", "job_description": "x", "timeouts": timeouts}).encode()
+        status, payload = _post(server, "/analyze", f"Content-Length: {len(body)}\r\n", body)
+        assert status == 400, payload
+        assert "timeouts" in payload["error"]
+
+
+def test_client_cache_is_bounded(monkeypatch):
+    monkeypatch.setenv("LLM_TRANSPORT", "synthetic")
+    monkeypatch.setattr(llm_client, "_clients", llm_client.OrderedDict())
+    first = llm_client.get_client("key-0")
+    for i in range(1, llm_client.MAX_CLIENTS + 5):
+        llm_client.get_client(f"key-{i}")
+
+    assert len(llm_client._clients) == llm_client.MAX_CLIENTS
+    assert llm_client.get_client("key-0") is not first
@@ -0,0 +1,56 @@
+from analysis_pipeline import new_stage_graph
+from chatbot import Chatbot
+from interview_bot import InterviewBot
+from session_store import TEXTS, CompactResume, SessionRecord, SessionRegistry
+
+
+def _context(resume_text: str) -> dict:
+    return {
+        "resume_data": {"text": resume_text, "skills": {}},
+        "job_data": {"raw_text": "Backend engineer: Python", "skills": {}, "category": "Backend"},
+        "ats_result": {"overall_score": 70},
+        "fit_result": {"reasoning": "Mostly aligned."},
+    }
+
+
+def test_chat_prefix_uses_shared_texts_and_is_counted():
+    resume_text = "Python developer " * 500
+    record = SessionRecord("s1")
+    bot = record.bots["chat"] = Chatbot(client=None)
+    baseline = record.approx_bytes()
+
+    key = TEXTS.put(resume_text)
+    bot.start_session(_context(resume_text))
+    assert resume_text in bot._prefix()["content"]
+    # Two holders share the resume text, so the bot is charged half of it
+    assert record.approx_bytes() - baseline >= len(resume_text) // 2
+
+    bot.reset()
+    TEXTS.release(key)
+    assert record.approx_bytes() == baseline
+
+
+def test_stage_memo_keeps_compact_parse_results():
+    graph = new_stage_graph()
+    inputs = {"resume": "r1", "job": "j1"}
+    parsed = graph.run("parse_resume", inputs, lambda: {"text": "Python", "skills": {"backend": ["python"]}})
+
+    assert isinstance(parsed, dict)
+    (memoized,) = graph.values()
+    assert isinstance(memoized, CompactResume)
+    assert graph.run("parse_resume", inputs, lambda: None)["skills"] == {"backend": ["python"]}
+
+
+def test_sweep_resets_every_bot_type():
+    record = SessionRecord("s2")
+    chatbot = record.bots["chatbot"] = Chatbot(client=None)
+    interviewer = record.bots["interviewer"] = InterviewBot(client=None)
+    chatbot.start_session(_context("Java developer"))
+    interviewer.memory.summary = "- Asked: tell me about yourself"
+
+    registry = SessionRegistry(idle_seconds=0)
+    registry.touch(record)              # first touch sweeps; the record is already idle
+
+    assert record.evicted
+    assert chatbot._context is None
+    assert interviewer.memory.summary == ""